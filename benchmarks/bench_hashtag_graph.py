@@ -0,0 +1,89 @@
+"""Measure hashtag graph ingest throughput, memory and related-tag lookup latency.
+
+Also times lookups for one hot tag that sits on every post while pairs are pending.
+Usage: python benchmarks/bench_hashtag_graph.py [n_posts] [n_tags]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utilis.hashtag_graph import HashtagGraph
+
+
+def make_posts(n_posts, n_tags, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for i in range(n_posts):
+        # Zipf-like popularity: a few tags everywhere, a long tail used rarely
+        tags = {f"tag{int(n_tags ** rng.random())}" for _ in range(rng.randint(1, 6))}
+        yield tags, start + timedelta(seconds=30 * i)
+
+
+def main():
+    n_posts = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    n_tags = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000_000
+    graph = HashtagGraph()
+
+    started = time.perf_counter()
+    for tags, timestamp in make_posts(n_posts, n_tags):
+        graph.add(tags, timestamp)
+    graph.flush()
+    elapsed = time.perf_counter() - started
+    csr_bytes = graph._indptr.nbytes + graph._indices.nbytes + graph._data.nbytes
+    print(f"{n_posts:,} posts -> {len(graph):,} tags, {len(graph._data):,} edges "
+          f"in {elapsed:.1f}s ({n_posts / elapsed:,.0f} posts/s), CSR {csr_bytes / 2**20:.1f} MiB")
+
+    rng = random.Random(1)
+    queries = [f"tag{int(len(graph) ** rng.random())}" for _ in range(10_000)]
+    for label in ('cold', 'warm'):
+        started = time.perf_counter()
+        for tag in queries:
+            graph.related(tag, 10)
+        print(f"related() {label}: {(time.perf_counter() - started) / len(queries) * 1e6:.1f} us/lookup")
+
+    # Lookups while fresh posts sit in the pending buffer
+    for tags, timestamp in make_posts(50_000, n_tags, seed=2):
+        graph.add(tags, timestamp + timedelta(days=400))
+    started = time.perf_counter()
+    for tag in queries:
+        graph.suggest(tag, 5)
+    print(f"suggest() with {graph._pending_entries:,} pending entries: "
+          f"{(time.perf_counter() - started) / len(queries) * 1e6:.1f} us/lookup")
+
+    hot_tag()
+
+
+def hot_tag(n_posts=300_000, n_pending=50_000, n_tags=20_000, repeats=200):
+    """Lookups for a tag on every post, with its fresh pairs still pending"""
+    graph = HashtagGraph()
+    for tags, timestamp in make_posts(n_posts, n_tags, seed=3):
+        graph.add(tags | {'fyp', 'dance'} if len(tags) % 5 == 0 else tags | {'fyp'}, timestamp)
+    graph.flush()
+
+    rng = random.Random(4)
+    later = datetime(2024, 1, 1) + timedelta(seconds=30 * n_posts)
+    for i in range(n_pending):
+        graph.add({'fyp', f"tag{int(n_tags ** rng.random())}"}, later + timedelta(seconds=30 * i))
+
+    for label, lookup in (("related('fyp')", lambda: graph.related('fyp', 10)),
+                          ("suggest('fyp dance')", lambda: graph.suggest('fyp dance', 5))):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            lookup()
+        print(f"{label} hot tag, {graph._pending_entries:,} pending entries: "
+              f"{(time.perf_counter() - started) / repeats * 1e6:.1f} us/lookup")
+
+    # Every lookup follows a new post on the hot tag, so its memo is always stale
+    started = time.perf_counter()
+    for i in range(repeats):
+        graph.add({'fyp', f"tag{int(n_tags ** rng.random())}"}, later + timedelta(seconds=30 * (n_pending + i)))
+        graph.related('fyp', 10)
+    print(f"related('fyp') after each new post: {(time.perf_counter() - started) / repeats * 1e6:.1f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Memory held by observations and forecasts as dicts vs slotted records vs struct-of-arrays.
+
+Usage: python benchmarks/bench_memory.py [n_observations] [n_topics]
+"""
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utilis import ForecastBatch, TrendData, TrendPredictor, TrendSeries
+
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    n_observations = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_topics = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    start = datetime(2024, 1, 1)
+
+    def timestamp(i):
+        return (start + timedelta(seconds=37 * i)).strftime('%Y-%m-%d %H:%M:%S')
+
+    def as_dicts():
+        return [{'timestamp': timestamp(i), 'view_count': 100000 + i} for i in range(n_observations)]
+
+    def as_slotted():
+        return [TrendData(timestamp(i), 100000 + i) for i in range(n_observations)]
+
+    def as_arrays():
+        seconds = np.datetime64(start, 's') + np.arange(n_observations, dtype=np.int64) * 37
+        return TrendSeries(seconds, np.arange(n_observations, dtype=np.int64) + 100000)
+
+    print(f"{n_observations:,} observations")
+    baseline = None
+    for name, build in (('dicts', as_dicts), ('__slots__ TrendData', as_slotted), ('TrendSeries arrays', as_arrays)):
+        size = measure(build)
+        baseline = baseline or size
+        print(f"  {name:<22} {size / 2**20:10.1f} MiB  {size / n_observations:6.1f} B/point  {baseline / size:6.1f}x smaller")
+
+    predictor = TrendPredictor()
+    history = TrendSeries(np.datetime64(start, 's') + np.arange(30) * np.timedelta64(1, 'D'),
+                          1000 + 10 * np.arange(30))
+    forecast = predictor.forecast_arrays(history)
+
+    def forecast_dicts():
+        return [forecast.to_dicts() for _ in range(n_topics)]
+
+    def forecast_batches():
+        return [ForecastBatch(forecast.dates.copy(), forecast.predicted_views.copy(), forecast.confidence.copy(),
+                              forecast.upper_bound.copy(), forecast.lower_bound.copy()) for _ in range(n_topics)]
+
+    def forecast_columns():
+        # One batch for every topic: what a compact multi-topic consumer holds
+        n_points = n_topics * len(forecast)
+        return ForecastBatch(np.resize(forecast.dates, n_points), np.resize(forecast.predicted_views, n_points),
+                             np.resize(forecast.confidence, n_points), np.resize(forecast.upper_bound, n_points),
+                             np.resize(forecast.lower_bound, n_points))
+
+    n_points = n_topics * len(forecast)
+    print(f"{n_topics:,} topic forecasts ({n_points:,} points)")
+    baseline = None
+    for name, build in (('dicts', forecast_dicts), ('ForecastBatch per topic', forecast_batches),
+                        ('one ForecastBatch', forecast_columns)):
+        size = measure(build)
+        baseline = baseline or size
+        print(f"  {name:<22} {size / 2**20:10.1f} MiB  {size / n_points:6.1f} B/point  {baseline / size:6.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare per-topic lag-7 corrcoef seasonality checks against the batched FFT detector.
+
+Usage: python benchmarks/bench_seasonality.py [n_topics] [series_length]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utilis.seasonality import SeasonalityDetector
+
+
+def legacy_detect(values):
+    # Previous TrendPredictor.detect_seasonality, one Python call per topic
+    if len(values) < 14:
+        return None
+    weekly_correlation = float(np.corrcoef(values[7:], values[:-7])[0, 1])
+    return 7 if abs(weekly_correlation) > 0.7 else None
+
+
+def make_series(n_topics, length, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(length)
+    weekly = 1000 * np.sin(2 * np.pi * t / 7)
+    series = 5000 + rng.normal(0, 300, size=(n_topics, length))
+    series[: n_topics // 2] += weekly
+    return series
+
+
+def main():
+    n_topics = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    series = make_series(n_topics, length)
+    rows = [list(row) for row in series]
+
+    start = time.perf_counter()
+    legacy = [legacy_detect(row) for row in rows]
+    legacy_time = time.perf_counter() - start
+
+    detector = SeasonalityDetector()
+    start = time.perf_counter()
+    periods, strengths = detector.detect_batch(series)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detector.detect_batch(rows)
+    ragged_time = time.perf_counter() - start
+
+    agreement = np.mean([(p or 0) == int(q) for p, q in zip(legacy, periods)])
+    print(f"topics={n_topics} length={length}")
+    print(f"legacy corrcoef loop: {legacy_time:8.3f}s ({n_topics / legacy_time:,.0f} topics/s)")
+    print(f"fft batch (matrix):   {batch_time:8.3f}s ({n_topics / batch_time:,.0f} topics/s)")
+    print(f"fft batch (lists):    {ragged_time:8.3f}s ({n_topics / ragged_time:,.0f} topics/s)")
+    print(f"speedup: {legacy_time / batch_time:.1f}x, agreement on weekly period: {agreement:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare default JSON encoding against the fast serializer and negotiated compression.
+
+Uses a /api/trend-predictions shaped payload (7 forecast dicts per topic).
+Usage: python benchmarks/bench_serialization.py [n_topics] [repeats]
+"""
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utilis import responses
+from utilis.responses import CompressedResponseCache, compress, dumps
+
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:
+    jsonable_encoder = None
+
+
+def make_payload(n_topics):
+    return {
+        'predictions': {
+            f"topic {i} challenge": [
+                {
+                    'date': f"2024-02-{day + 1:02d}",
+                    'predicted_views': 100000 + i * 7 + day,
+                    'confidence': round(90 - day * 3.5, 2),
+                    'upper_bound': 120000 + i,
+                    'lower_bound': 80000 + i
+                }
+                for day in range(7)
+            ]
+            for i in range(n_topics)
+        },
+        'updated_at': '2024-02-01 00:00:00'
+    }
+
+
+def default_render(payload):
+    # What FastAPI does for a returned dict: jsonable_encoder, then JSONResponse.render
+    content = jsonable_encoder(payload) if jsonable_encoder else payload
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')).encode('utf-8')
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats, result
+
+
+class FakeRequest:
+    def __init__(self, accept_encoding):
+        self.headers = {'accept-encoding': accept_encoding}
+
+
+def main():
+    n_topics = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    payload = make_payload(n_topics)
+
+    default_time, default_body = timed(lambda: default_render(payload), repeats)
+    fast_time, fast_body = timed(lambda: dumps(payload), repeats)
+    print(f"topics={n_topics} serializer={'orjson' if responses.orjson else 'stdlib json'}")
+    print(f"default encoder: {default_time * 1000:8.1f} ms  {len(default_body):>12,} bytes")
+    print(f"fast dumps:      {fast_time * 1000:8.1f} ms  {len(fast_body):>12,} bytes")
+
+    encodings = ['gzip'] + (['br'] if responses.brotli else [])
+    for encoding in encodings:
+        compress_time, compressed = timed(lambda: compress(fast_body, encoding), repeats)
+        print(f"{encoding:>4} compress:   {compress_time * 1000:8.1f} ms  {len(compressed):>12,} bytes "
+              f"({len(compressed) / len(fast_body):.1%} of raw)")
+
+        cache = CompressedResponseCache()
+        request = FakeRequest(encoding)
+        cache.render(request, payload)
+        cached_time, _ = timed(lambda: cache.render(request, payload), repeats)
+        print(f"{encoding:>4} cached render: {cached_time * 1000:6.1f} ms "
+              f"(vs {(default_time + compress_time) * 1000:.1f} ms default encode + compress)")
+
+    # Sanity check: compressed output round-trips to the same document
+    assert json.loads(gzip.decompress(compress(fast_body, 'gzip'))) == json.loads(default_body)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Measure per-item MinHash/LSH cluster assignment cost as the number of distinct texts grows.
+
+Usage: python benchmarks/bench_topic_clustering.py [n_texts]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utilis.topic_clustering import TopicClusterer
+
+WORDS = ['dance', 'challenge', 'recipe', 'tutorial', 'tech', 'news', 'update', 'sports',
+         'championship', 'music', 'festival', 'ai', 'workout', 'morning', 'routine', 'hack']
+
+
+def make_texts(n, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        words = [f"{rng.choice(WORDS)}{rng.randint(0, 999)}" for _ in range(3)]
+        # Roughly a third of the stream are near-duplicate variants
+        if rng.random() < 0.3:
+            words.append(rng.choice(['!!', '2024', 'fyp', 'viral']))
+        yield ' '.join(words).title(), [rng.choice(WORDS)]
+
+
+def main():
+    n_texts = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    clusterer = TopicClusterer()
+    checkpoint = max(1, n_texts // 5)
+
+    start = last = time.perf_counter()
+    for i, (text, hashtags) in enumerate(make_texts(n_texts), 1):
+        clusterer.assign(text, hashtags)
+        if i % checkpoint == 0:
+            now = time.perf_counter()
+            print(f"{i:>10,} texts  {len(clusterer):>10,} clusters  {(now - last) / checkpoint * 1e6:7.1f} us/item")
+            last = now
+
+    print(f"total {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime, timedelta
+
+from utilis import TrendPredictor
+from utilis.backtest import run_backtest
+from utilis.batch import BatchPipeline, read_posts, parse_hashtags, post_seconds, post_views
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    stream=sys.stderr
+)
+logger = logging.getLogger(__name__)
+
+
+def read_history_ndjson(path):
+    """Yield history rows from an NDJSON file (e.g. an /api/trends/history export), '-' for stdin"""
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def read_history_db(days):
+    """Yield history rows from the database with a server-side cursor"""
+    from database import SessionLocal
+    from models import Trend
+
+    since = datetime.utcnow() - timedelta(days=days)
+    db = SessionLocal()
+    try:
+        query = db.query(Trend.text, Trend.hashtags, Trend.view_count, Trend.created_at).filter(
+            Trend.created_at >= since
+        ).order_by(Trend.created_at)
+        for row in query.yield_per(1000):
+            yield {
+                'text': row.text,
+                'hashtags': row.hashtags or [],
+                'view_count': row.view_count,
+                'timestamp': row.created_at.strftime('%Y-%m-%d %H:%M:%S')
+            }
+    finally:
+        db.close()
+
+
+def backtest(args):
+    history = read_history_ndjson(args.input) if args.input else read_history_db(args.days)
+    predictor = TrendPredictor(args.interval)
+    topic_series = predictor.prepare_topic_series(history)
+    logger.info(f"Loaded {len(topic_series)} topic series")
+
+    result = run_backtest(
+        topic_series,
+        alphas=args.alpha,
+        sequence_lengths=args.sequence_length,
+        horizon=args.horizon,
+        min_train=args.min_train,
+        step=args.step,
+        interval=args.interval,
+        workers=args.workers
+    )
+
+    print(f"{'alpha':>6} {'seq_len':>7} {'points':>10} {'MAE':>12} {'MAPE %':>8} {'coverage':>8}")
+    for row in result['grid']:
+        print(f"{row['alpha']:>6} {row['sequence_length']:>7} {row['points']:>10,} "
+              f"{row['mae'] if row['mae'] is not None else '-':>12} "
+              f"{row['mape'] if row['mape'] is not None else '-':>8} "
+              f"{row['coverage'] if row['coverage'] is not None else '-':>8}")
+    print(f"{result['points_scored']:,} points over {result['topics_evaluated']} topics "
+          f"({result['topics_skipped']} too short) in {result['elapsed_seconds']}s, "
+          f"{result['points_per_second']:,} points/s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        logger.info(f"Wrote per-topic scores to {args.output}")
+
+
+def make_db_loader():
+    """Return a callback that bulk-inserts each chunk of posts as Trend rows"""
+    from database import SessionLocal
+    from models import Platform, Trend
+
+    platform_ids = {}
+
+    def load(chunk):
+        db = SessionLocal()
+        try:
+            rows = []
+            skipped = 0
+            for post in chunk:
+                if not post.get('text'):
+                    continue
+                # Malformed rows are left out (the pipeline counts them) so one row can't abort the load
+                try:
+                    hashtags = parse_hashtags(post.get('hashtags'))
+                    seconds = post_seconds(post)
+                    views = post_views(post)
+                except (ValueError, TypeError):
+                    skipped += 1
+                    continue
+
+                name = post.get('platform') or 'unknown'
+                if name not in platform_ids:
+                    platform = db.query(Platform).filter(Platform.name.ilike(name)).first()
+                    if platform is None:
+                        platform = Platform(name=name)
+                        db.add(platform)
+                        db.flush()
+                    platform_ids[name] = platform.id
+                rows.append({
+                    'text': post['text'][:200],
+                    'hashtags': hashtags,
+                    'view_count': views,
+                    'platform_id': platform_ids[name],
+                    'created_at': datetime.utcfromtimestamp(seconds) if seconds is not None else datetime.utcnow()
+                })
+            db.bulk_insert_mappings(Trend, rows)
+            db.commit()
+            if skipped:
+                logger.warning(f"Left {skipped} malformed posts out of the database load")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    return load
+
+
+def batch(args):
+    pipeline = BatchPipeline(
+        interval=args.interval,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        loader=make_db_loader() if args.load_db else None
+    )
+
+    forecasts_out = sys.stdout if args.forecasts == '-' else open(args.forecasts, 'w', encoding='utf-8')
+    try:
+        report = pipeline.run(read_posts(args.inputs), forecasts_out)
+    finally:
+        if forecasts_out is not sys.stdout:
+            forecasts_out.close()
+
+    if args.analysis:
+        with open(args.analysis, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Wrote analysis to {args.analysis}")
+    else:
+        logger.info(f"Top keywords: {report['top_keywords']}")
+
+    stats = report['batch']
+    logger.info(f"Processed {stats['posts']:,} posts into {stats['forecasts']:,} forecasts "
+                f"in {stats['elapsed_seconds']}s ({stats['posts_per_second']:,} posts/s)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Offline tools for the Social Media Trend Analyzer")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    bt = subparsers.add_parser('backtest', help="Walk-forward backtest of TrendPredictor over stored history")
+    bt.add_argument('--input', help="NDJSON history file ('-' for stdin); defaults to the database")
+    bt.add_argument('--days', type=int, default=90, help="History window when reading from the database")
+    bt.add_argument('--alpha', type=float, nargs='+', default=[0.3], help="Smoothing factors to evaluate")
+    bt.add_argument('--sequence-length', type=int, nargs='+', default=[7], help="Trend look-back lengths to evaluate")
+    bt.add_argument('--horizon', type=int, default=7, help="Buckets forecast at each split")
+    bt.add_argument('--min-train', type=int, default=14, help="Buckets of history before the first split")
+    bt.add_argument('--step', type=int, default=1, help="Buckets between split origins")
+    bt.add_argument('--interval', choices=['hour', 'day'], default='day', help="Resampling interval")
+    bt.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    bt.add_argument('--output', help="Write the full per-topic report as JSON")
+    bt.set_defaults(func=backtest)
+
+    bp = subparsers.add_parser('batch', help="Analyze and forecast archived posts from NDJSON/CSV files")
+    bp.add_argument('inputs', nargs='*', default=['-'], help="NDJSON or .csv files ('-' or nothing for NDJSON on stdin)")
+    bp.add_argument('--forecasts', default='-', help="NDJSON forecast output, one topic per line ('-' for stdout)")
+    bp.add_argument('--analysis', help="Write the keyword/platform/cluster analysis as JSON")
+    bp.add_argument('--load-db', action='store_true', help="Bulk-insert the posts into the trend table")
+    bp.add_argument('--interval', choices=['hour', 'day'], default='day', help="Resampling interval")
+    bp.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    bp.add_argument('--chunk-size', type=int, default=5000, help="Posts per worker task")
+    bp.set_defaults(func=batch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except Exception as e:
+        logger.error(f"{args.command} failed: {str(e)}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Makes the repository root importable for tests (utilis, cli, main)
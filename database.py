@@ -46,6 +46,10 @@ def init_db():
     try:
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
+        # create_all skips tables that already exist, so add indexes introduced since
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to create database tables: {str(e)}", exc_info=True)
@@ -1,14 +1,17 @@
-from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi import FastAPI, Request, HTTPException, Depends, Query, Body
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+import base64
 import logging
 import sys
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from sqlalchemy import desc
+from typing import Optional, List
+from sqlalchemy import desc, func, or_, and_
 
 # Import utilities
 from utils import (
@@ -18,8 +21,12 @@ from utils import (
     get_mock_trends
 )
 from utils.trend_predictor import TrendPredictor
+from utils.coalescing import SingleFlight
+from utils.responses import FastJSONResponse, CompressedResponseCache, dumps
+from utils.topic_index import TopicIndex
+from utils.hashtag_graph import HashtagGraph
 from models import Trend, TrendPrediction, TrendEngagement, Platform, Content
-from database import get_db, init_db
+from database import get_db, init_db, SessionLocal
 
 # Configure logging
 logging.basicConfig(
@@ -33,7 +40,7 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent
 
 # Initialize FastAPI app
-app = FastAPI(title="Social Media Trend Analyzer")
+app = FastAPI(title="Social Media Trend Analyzer", default_response_class=FastJSONResponse)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
@@ -44,8 +51,24 @@ templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 # Initialize components
 api_client = SocialMediaAPI()
 trend_analyzer = TrendAnalyzer()
-content_recommender = ContentRecommender()
+hashtag_graph = HashtagGraph()
+content_recommender = ContentRecommender(hashtag_graph)
 trend_predictor = TrendPredictor()
+request_coalescer = SingleFlight()
+response_cache = CompressedResponseCache()
+# Shares the bulk forecast's clusterer so per-topic labels match /api/trend-predictions keys
+topic_index = TopicIndex(trend_predictor)
+
+# Most recent /api/trends analysis, reused by batch recommendations while fresh
+latest_trends: Optional[dict] = None
+latest_trends_at: Optional[datetime] = None
+LATEST_TRENDS_MAX_AGE = timedelta(minutes=15)
+RECOMMENDATIONS_MAX_TOPICS = 50
+
+# History export settings
+HISTORY_PAGE_SIZE = 100
+HISTORY_MAX_PAGE_SIZE = 1000
+HISTORY_STREAM_BATCH = 1000
 
 # Initialize database on startup
 @app.on_event("startup")
@@ -58,6 +81,32 @@ async def startup_event():
         logger.error(f"Database initialization failed: {str(e)}")
         sys.exit(1)
 
+    try:
+        await run_in_threadpool(_load_topic_index)
+    except Exception as e:
+        logger.warning(f"Index warm-up failed, per-topic forecasts and hashtag suggestions start empty: {str(e)}")
+
+def _load_topic_index():
+    """Index the same 30-day window /api/trend-predictions forecasts from, feeding the hashtag graph on the way"""
+    db = SessionLocal()
+    try:
+        since = datetime.utcnow() - timedelta(days=topic_index.window_days)
+        query = db.query(Trend.text, Trend.hashtags, Trend.view_count, Trend.created_at).filter(
+            Trend.created_at >= since
+        ).order_by(Trend.created_at)
+
+        def rows():
+            for row in query.yield_per(HISTORY_STREAM_BATCH):
+                row = row._asdict()
+                hashtag_graph.add(row['hashtags'], row['created_at'], row['text'])
+                yield row
+
+        topic_index.load(rows())
+        hashtag_graph.flush()
+        logger.info(f"Hashtag graph warmed with {len(hashtag_graph)} tags")
+    finally:
+        db.close()
+
 @app.get("/")
 async def index(request: Request):
     try:
@@ -76,10 +125,10 @@ async def dashboard(request: Request):
         logger.error(f"Error in dashboard route: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/trends")
-async def get_trends(db: Session = Depends(get_db)):
+def _compute_trends() -> dict:
+    """Fetch, analyze and store current trends"""
+    db = SessionLocal()
     try:
-        logger.info("Fetching trends data")
         # Try to get real data, fallback to mock data
         try:
             tiktok_trends = api_client.get_tiktok_trends()
@@ -89,6 +138,9 @@ async def get_trends(db: Session = Depends(get_db)):
             tiktok_trends, twitter_trends = get_mock_trends()
 
         analyzed_trends = trend_analyzer.analyze_trends(tiktok_trends, twitter_trends)
+        global latest_trends, latest_trends_at
+        latest_trends = analyzed_trends
+        latest_trends_at = datetime.utcnow()
 
         # Store trends in database
         platforms = {
@@ -102,6 +154,7 @@ async def get_trends(db: Session = Depends(get_db)):
         db.commit()
 
         # Store trends
+        observed_at = datetime.utcnow()
         trends = tiktok_trends + twitter_trends
         for t in trends:
             platform = platforms['tiktok'] if t in tiktok_trends else platforms['twitter']
@@ -109,16 +162,161 @@ async def get_trends(db: Session = Depends(get_db)):
                 text=t['text'],
                 hashtags=t.get('hashtags', []),
                 view_count=t.get('views', t.get('tweet_count', 0)),
-                platform=platform
+                platform=platform,
+                created_at=observed_at
             )
             db.add(trend)
         db.commit()
 
+        # New observations invalidate only their own topic's memoized forecast
+        for t in trends:
+            topic_index.add(t['text'], observed_at, t.get('views', t.get('tweet_count', 0)), t.get('hashtags', []))
+            hashtag_graph.add(t.get('hashtags', []), observed_at, t['text'])
+
         return analyzed_trends
+    finally:
+        db.close()
+
+@app.get("/api/trends")
+async def get_trends(request: Request):
+    try:
+        logger.info("Fetching trends data")
+        key = SingleFlight.make_key("/api/trends")
+        analyzed_trends = await request_coalescer.do(key, lambda: run_in_threadpool(_compute_trends))
+        return response_cache.render(request, analyzed_trends)
     except Exception as e:
         logger.error(f"Error in get_trends: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+def _encode_cursor(created_at: datetime, trend_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{trend_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, trend_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(trend_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so a topic filter matches them literally"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _history_query(db: Session, platform: Optional[str], topic: Optional[str],
+                   start: Optional[datetime], end: Optional[datetime], cursor: Optional[str]):
+    """Build the keyset-ordered history query shared by paged and streamed exports"""
+    query = db.query(
+        Trend.id, Trend.text, Trend.hashtags, Trend.view_count, Trend.created_at,
+        Platform.name.label('platform')
+    ).join(Platform, Trend.platform_id == Platform.id)
+
+    if platform:
+        query = query.filter(func.lower(Platform.name) == platform.lower())
+    if topic:
+        query = query.filter(Trend.text.ilike(f"%{_escape_like(topic)}%", escape='\\'))
+    if start:
+        query = query.filter(Trend.created_at >= start)
+    if end:
+        query = query.filter(Trend.created_at < end)
+    if cursor:
+        # Seek past the last row of the previous page instead of using OFFSET
+        last_created_at, last_id = _decode_cursor(cursor)
+        query = query.filter(or_(
+            Trend.created_at > last_created_at,
+            and_(Trend.created_at == last_created_at, Trend.id > last_id)
+        ))
+
+    return query.order_by(Trend.created_at, Trend.id)
+
+def _history_row(row) -> dict:
+    return {
+        'id': row.id,
+        'text': row.text,
+        'hashtags': row.hashtags or [],
+        'view_count': row.view_count,
+        'platform': row.platform,
+        'timestamp': row.created_at.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def _stream_history(platform, topic, start, end, cursor):
+    # The request-scoped session may be closed before streaming finishes, so use our own
+    db = SessionLocal()
+    try:
+        query = _history_query(db, platform, topic, start, end, cursor)
+        for row in query.yield_per(HISTORY_STREAM_BATCH):
+            yield dumps(_history_row(row)) + b"\n"
+    except Exception as e:
+        # Re-raise so the chunked response is aborted instead of ending like a complete export
+        logger.error(f"Error streaming trend history: {str(e)}", exc_info=True)
+        raise
+    finally:
+        db.close()
+
+@app.get("/api/trends/history")
+async def get_trend_history(
+    platform: Optional[str] = None,
+    topic: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    format: str = 'json',
+    db: Session = Depends(get_db)
+):
+    """Export stored trends page by page, or as one NDJSON stream with format=ndjson"""
+    if format not in ('json', 'ndjson'):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'ndjson'")
+
+    if format == 'ndjson':
+        logger.info("Streaming trend history as NDJSON")
+        if cursor:
+            _decode_cursor(cursor)  # Reject bad cursors before the stream starts
+        return StreamingResponse(
+            _stream_history(platform, topic, start, end, cursor),
+            media_type="application/x-ndjson"
+        )
+
+    try:
+        logger.info(f"Fetching trend history page (limit={limit})")
+        rows = _history_query(db, platform, topic, start, end, cursor).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # Rows are already JSON-native, so skip FastAPI's jsonable_encoder pass
+        return FastJSONResponse({
+            'trends': [_history_row(row) for row in rows],
+            'next_cursor': _encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching trend history: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _store_recommendations(db: Session, batch: dict) -> None:
+    """Persist video and image ideas for every topic with a single bulk insert"""
+    latest_trend = db.query(Trend.id).order_by(desc(Trend.created_at)).first()
+    if not latest_trend:
+        return
+
+    rows = []
+    for recommendations in batch.values():
+        for rec_type, ideas in recommendations.items():
+            if isinstance(ideas, list) and rec_type in ['video_ideas', 'image_ideas']:
+                for idea in ideas:
+                    rows.append({
+                        'type': rec_type.split('_')[0],
+                        'suggestion': idea['suggestion'],
+                        'format': idea['format'],
+                        'estimated_engagement': idea['estimated_engagement'],
+                        'trend_id': latest_trend.id
+                    })
+
+    if rows:
+        db.bulk_insert_mappings(Content, rows)
+        db.commit()
+
 @app.get("/api/recommendations")
 async def get_recommendations(topic: str, db: Session = Depends(get_db)):
     try:
@@ -126,47 +324,71 @@ async def get_recommendations(topic: str, db: Session = Depends(get_db)):
         recommendations = content_recommender.get_recommendations(topic)
 
         # Store recommendations
-        latest_trend = db.query(Trend).order_by(desc(Trend.created_at)).first()
-        if latest_trend:
-            for rec_type, ideas in recommendations.items():
-                if isinstance(ideas, list) and rec_type in ['video_ideas', 'image_ideas']:
-                    for idea in ideas:
-                        content = Content(
-                            type=rec_type.split('_')[0],
-                            suggestion=idea['suggestion'],
-                            format=idea['format'],
-                            estimated_engagement=idea['estimated_engagement'],
-                            trend=latest_trend
-                        )
-                        db.add(content)
-            db.commit()
+        _store_recommendations(db, {topic: recommendations})
 
-        return recommendations
+        return FastJSONResponse(recommendations)
     except Exception as e:
         logger.error(f"Error generating recommendations: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/trend-predictions")
-async def get_trend_predictions(db: Session = Depends(get_db)):
+def _batch_recommendations(db: Session, topics: List[str]) -> dict:
+    batch = content_recommender.get_batch_recommendations(topics)
+    _store_recommendations(db, batch)
+    return {'recommendations': batch}
+
+@app.get("/api/recommendations/batch")
+async def get_top_recommendations(limit: int = Query(5, ge=1, le=RECOMMENDATIONS_MAX_TOPICS),
+                                  db: Session = Depends(get_db)):
+    """Recommendations for the current top-N trending topics in one round trip"""
+    try:
+        analyzed_trends = latest_trends
+        if analyzed_trends is None or datetime.utcnow() - latest_trends_at > LATEST_TRENDS_MAX_AGE:
+            key = SingleFlight.make_key("/api/trends")
+            analyzed_trends = await request_coalescer.do(key, lambda: run_in_threadpool(_compute_trends))
+
+        topics = [t['topic'] for t in analyzed_trends['trending_topics'][:limit]]
+        logger.info(f"Generating batch recommendations for {len(topics)} trending topics")
+        return FastJSONResponse(_batch_recommendations(db, topics))
+    except Exception as e:
+        logger.error(f"Error generating batch recommendations: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/recommendations/batch")
+async def post_batch_recommendations(topics: List[str] = Body(..., embed=True), db: Session = Depends(get_db)):
+    """Recommendations for a posted list of topics in one round trip"""
+    if len(topics) > RECOMMENDATIONS_MAX_TOPICS:
+        raise HTTPException(status_code=422, detail=f"At most {RECOMMENDATIONS_MAX_TOPICS} topics per request")
+
+    try:
+        logger.info(f"Generating batch recommendations for {len(topics)} topics")
+        return FastJSONResponse(_batch_recommendations(db, topics))
+    except Exception as e:
+        logger.error(f"Error generating batch recommendations: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _compute_trend_predictions() -> dict:
+    """Forecast every topic from the last 30 days and store the predictions"""
+    db = SessionLocal()
     try:
-        logger.info("Generating trend predictions")
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        historical_trends = []
 
         logger.debug("Querying historical trends from database")
-        db_trends = db.query(Trend).filter(
+        db_trends = db.query(Trend.text, Trend.hashtags, Trend.created_at, Trend.view_count).filter(
             Trend.created_at >= thirty_days_ago
-        ).all()
+        ).yield_per(HISTORY_STREAM_BATCH)
 
-        for trend in db_trends:
-            historical_trends.append({
+        # Rows are streamed straight into the predictor's compact arrays, one short-lived dict at a time
+        historical_trends = (
+            {
                 'text': trend.text,
-                'timestamp': trend.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'hashtags': trend.hashtags or [],
+                'timestamp': trend.created_at,
                 'view_count': trend.view_count
-            })
-
-        logger.debug(f"Found {len(historical_trends)} historical trends")
+            }
+            for trend in db_trends
+        )
         topic_forecasts = trend_predictor.get_trending_topics_forecast(historical_trends)
+        logger.debug(f"Forecast {len(topic_forecasts)} topics")
 
         # Store predictions
         for topic, predictions in topic_forecasts.items():
@@ -182,7 +404,7 @@ async def get_trend_predictions(db: Session = Depends(get_db)):
                         predicted_views=pred['predicted_views'],
                         confidence_score=pred['confidence'],
                         prediction_date=datetime.utcnow(),
-                        target_date=datetime.strptime(pred['date'], '%Y-%m-%d')
+                        target_date=datetime.fromisoformat(pred['date'])
                     )
                     db.add(prediction)
         db.commit()
@@ -191,10 +413,59 @@ async def get_trend_predictions(db: Session = Depends(get_db)):
             'predictions': topic_forecasts,
             'updated_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
         }
+    finally:
+        db.close()
+
+@app.get("/api/trend-predictions")
+async def get_trend_predictions(request: Request):
+    try:
+        logger.info("Generating trend predictions")
+        key = SingleFlight.make_key("/api/trend-predictions")
+        predictions = await request_coalescer.do(key, lambda: run_in_threadpool(_compute_trend_predictions))
+        return response_cache.render(request, predictions)
     except Exception as e:
         logger.error(f"Error generating trend predictions: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/trend-predictions/{topic}")
+async def get_topic_predictions(topic: str, request: Request):
+    """Forecast a single topic on demand, memoized until new data for it arrives"""
+    try:
+        logger.info(f"Generating trend predictions for topic: {topic}")
+        result = topic_index.forecast(topic)
+    except Exception as e:
+        logger.error(f"Error generating predictions for {topic}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Unknown topic: {topic}")
+
+    label, predictions = result
+    return response_cache.render(request, {
+        'topic': label,
+        'predictions': predictions,
+        'updated_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    })
+
+@app.get("/api/hashtags/related")
+async def get_related_hashtags(tag: str, limit: int = Query(10, ge=1, le=20)):
+    """Hashtags most often used together with `tag`, weighted by recency"""
+    try:
+        related = hashtag_graph.related(tag, limit)
+    except Exception as e:
+        logger.error(f"Error looking up hashtags related to {tag}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        'tag': tag,
+        'related': [{'hashtag': f"#{related_tag}", 'weight': weight} for related_tag, weight in related]
+    }
+
+@app.get("/api/coalescing-stats")
+async def get_coalescing_stats():
+    """How many expensive requests shared an in-flight computation"""
+    return {**request_coalescer.stats(), 'compression_cache': response_cache.stats()}
+
 @app.post("/api/generate-content")
 async def generate_content(content_type: str, topic: str, db: Session = Depends(get_db)):
     try:
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -12,6 +12,10 @@ class Platform(Base):
 
 class Trend(Base):
     __tablename__ = "trend"
+    __table_args__ = (
+        # Keyset pagination order for history exports
+        Index('ix_trend_created_at_id', 'created_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True)
     text = Column(String(200), nullable=False)
@@ -0,0 +1,52 @@
+import json
+from datetime import datetime, timedelta
+
+import cli
+
+
+def write_history(path, days=40):
+    start = datetime(2024, 1, 1)
+    with open(path, 'w', encoding='utf-8') as f:
+        for day in range(days):
+            timestamp = (start + timedelta(days=day)).strftime('%Y-%m-%d %H:%M:%S')
+            for text, views in (("Dance Challenge 2024", 1000 + 50 * day), ("Tech News Update", 5000 - 20 * day)):
+                f.write(json.dumps({'text': text, 'hashtags': [], 'view_count': views, 'timestamp': timestamp}) + "\n")
+
+
+def test_backtest_smoke(tmp_path, capsys):
+    history, output = tmp_path / 'history.ndjson', tmp_path / 'backtest.json'
+    write_history(history)
+
+    cli.main(['backtest', '--input', str(history), '--alpha', '0.3', '0.5', '--workers', '1',
+              '--output', str(output)])
+
+    result = json.loads(output.read_text())
+    assert result['topics_evaluated'] == 2
+    assert len(result['grid']) == 2
+    assert all(row['points'] > 0 and row['mae'] is not None for row in result['grid'])
+    assert 'points over 2 topics' in capsys.readouterr().out
+
+
+def test_batch_skips_malformed_rows(tmp_path):
+    posts, forecasts, analysis = tmp_path / 'posts.ndjson', tmp_path / 'forecasts.ndjson', tmp_path / 'analysis.json'
+    start = datetime(2024, 1, 1)
+    lines = [json.dumps({'text': "Dance Challenge 2024", 'hashtags': ['dance'], 'platform': 'tiktok',
+                         'views': 1000 + 100 * day,
+                         'timestamp': (start + timedelta(days=day)).isoformat()}) for day in range(10)]
+    lines += [
+        json.dumps({'text': "Dance Challenge 2024", 'views': 5, 'timestamp': "yesterday"}),
+        json.dumps({'text': "Dance Challenge 2024", 'views': "lots", 'timestamp': start.isoformat()}),
+        '{"text": "truncated',
+    ]
+    posts.write_text("\n".join(lines) + "\n")
+
+    cli.main(['batch', str(posts), '--forecasts', str(forecasts), '--analysis', str(analysis),
+              '--workers', '1', '--chunk-size', '4'])
+
+    report = json.loads(analysis.read_text())
+    assert report['batch']['posts'] == 13
+    assert report['batch']['skipped'] == 3
+    assert report['batch']['forecasts'] == 1
+    forecast = json.loads(forecasts.read_text().splitlines()[0])
+    assert forecast['topic'] == "dance challenge 2024"
+    assert len(forecast['predictions']) == 7
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from utilis.coalescing import SingleFlight
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight()
+        runs = 0
+        release = asyncio.Event()
+
+        async def compute():
+            nonlocal runs
+            runs += 1
+            await release.wait()
+            return {'value': 42}
+
+        key = SingleFlight.make_key('/api/trends')
+        waiters = [asyncio.ensure_future(flight.do(key, compute)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        return flight, runs, results
+
+    flight, runs, results = run(scenario())
+    assert runs == 1
+    assert all(result == {'value': 42} for result in results)
+    assert flight.stats()['executions'] == 1
+    assert flight.stats()['coalesced'] == 9
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_exception_reaches_every_waiter_and_clears_key():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise RuntimeError('upstream down')
+
+        waiters = [asyncio.ensure_future(flight.do('key', failing)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        async def succeeding():
+            return 'ok'
+
+        # The failed task is not reused for later calls
+        retry = await flight.do('key', succeeding)
+        return flight, results, retry
+
+    flight, results, retry = run(scenario())
+    assert all(isinstance(r, RuntimeError) and str(r) == 'upstream down' for r in results)
+    assert retry == 'ok'
+    assert flight.stats()['errors'] == 1
+    assert flight.stats()['executions'] == 2
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_shared_task():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        runs = 0
+
+        async def compute():
+            nonlocal runs
+            runs += 1
+            await release.wait()
+            return 'done'
+
+        first = asyncio.ensure_future(flight.do('key', compute))
+        second = asyncio.ensure_future(flight.do('key', compute))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return first, await second, runs
+
+    first, second_result, runs = run(scenario())
+    assert first.cancelled()
+    assert second_result == 'done'
+    assert runs == 1
+
+
+def test_make_key_ignores_parameter_order():
+    assert SingleFlight.make_key('/x', a=1, b=2) == SingleFlight.make_key('/x', b=2, a=1)
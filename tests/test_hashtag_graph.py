@@ -0,0 +1,56 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+from utilis.content_recommender import ContentRecommender
+from utilis.hashtag_graph import HashtagGraph
+
+START = datetime(2024, 1, 1)
+
+
+def test_related_tags_ranked_by_decayed_weight():
+    graph = HashtagGraph(half_life_days=1, merge_threshold=4)
+    graph.add(['#AI', 'tech'], START)
+    graph.add(['ai', 'tech'], START)
+    graph.add(['ai', 'ml'], START + timedelta(days=1))
+    graph.add(['ai', 'news'], START + timedelta(days=1))
+
+    assert graph.related('#ai') == [('tech', 1.0), ('ml', 1.0), ('news', 1.0)]
+    assert graph.related('unknown') == []
+
+
+def test_pending_entries_visible_before_merge():
+    graph = HashtagGraph(merge_threshold=1000)
+    graph.add(['dance', 'viral'], START)
+    assert [tag for tag, _ in graph.related('dance')] == ['viral']
+    graph.flush()
+    graph.add(['dance', 'fyp'], START)
+    graph.add(['dance', 'fyp'], START)
+    assert [tag for tag, _ in graph.related('dance')] == ['fyp', 'viral']
+
+
+
+def test_related_matches_counts_across_merges():
+    graph = HashtagGraph(merge_threshold=50, cache_k=5)
+    counts = Counter()
+    rng = random.Random(0)
+    for _ in range(300):
+        tags = {f"t{int(30 ** rng.random())}" for _ in range(rng.randint(2, 4))}
+        graph.add(tags, START)
+        counts.update((a, b) for a in tags for b in tags if a != b)
+
+        tag = f"t{int(30 ** rng.random())}"
+        expected = sorted((n for (a, _), n in counts.items() if a == tag), reverse=True)[:5]
+        related = graph.related(tag, 5)
+        assert [weight for _, weight in related] == expected
+        assert all(counts[(tag, other)] == weight for other, weight in related)
+
+
+def test_recommender_prefers_observed_tags():
+    graph = HashtagGraph()
+    graph.add(['dance', 'viral'], START, "Dance Challenge 2024")
+    recommender = ContentRecommender(graph)
+
+    assert recommender.get_recommendations("Dance Challenge 2024")['hashtags'][:2] == ['#dance', '#viral']
+    assert len(recommender.get_recommendations("Dance Challenge 2024")['hashtags']) == 5
+    assert recommender.get_recommendations("cooking")['hashtags'] == ContentRecommender().get_recommendations("cooking")['hashtags']
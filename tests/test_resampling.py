@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from utilis.resampling import TimeResampler
+
+# Out of order on purpose; two readings on day 1, none on day 3
+TIMESTAMPS = ['2024-01-04 12:00:00', '2024-01-01 20:00:00', '2024-01-02 05:00:00', '2024-01-01 10:00:00']
+VALUES = [50, 30, 20, 10]
+DAYS = ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']
+
+
+@pytest.mark.parametrize('aggregation, expected', [
+    ('last', [30, 20, 20, 50]),
+    ('first', [10, 20, 20, 50]),
+    ('mean', [20, 20, 20, 50]),
+    ('sum', [40, 20, 20, 50]),
+    ('max', [30, 20, 20, 50]),
+    ('min', [10, 20, 20, 50]),
+    ('count', [2, 1, 1, 1]),
+])
+def test_aggregations(aggregation, expected):
+    grid, values = TimeResampler('day', aggregation, 'ffill').resample(TIMESTAMPS, VALUES)
+    assert grid.astype(str).tolist() == DAYS
+    assert values.tolist() == expected
+
+
+@pytest.mark.parametrize('fill, days, expected', [
+    ('ffill', DAYS, [30, 20, 20, 50]),
+    ('zero', DAYS, [30, 20, 0, 50]),
+    ('linear', DAYS, [30, 20, 35, 50]),
+    ('none', ['2024-01-01', '2024-01-02', '2024-01-04'], [30, 20, 50]),
+])
+def test_fills(fill, days, expected):
+    grid, values = TimeResampler('day', 'last', fill).resample(TIMESTAMPS, VALUES)
+    assert grid.astype(str).tolist() == days
+    assert values.tolist() == expected
+
+
+def test_hour_interval():
+    resampler = TimeResampler('hour', 'mean', 'linear')
+    grid, values = resampler.resample(['2024-01-01 10:15:00', '2024-01-01 10:45:00', '2024-01-01 13:05:00'],
+                                      [100, 200, 450])
+    assert grid.astype('datetime64[s]').astype(str).tolist() == [
+        '2024-01-01T10:00:00', '2024-01-01T11:00:00', '2024-01-01T12:00:00', '2024-01-01T13:00:00']
+    assert values.tolist() == [150, 250, 350, 450]
+    assert resampler.date_format == '%Y-%m-%d %H:%M:%S'
+
+
+def test_empty_input():
+    grid, values = TimeResampler().resample(np.array([], dtype='datetime64[s]'), [])
+    assert len(grid) == 0 and len(values) == 0
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'interval': 'week'},
+    {'aggregation': 'median'},
+    {'fill': 'bfill'},
+])
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        TimeResampler(**kwargs)
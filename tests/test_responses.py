@@ -0,0 +1,41 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from utilis import responses
+
+PAYLOAD = {
+    'updated_at': datetime(2024, 5, 1, 12, 30, 5),
+    'confidence': float('nan'),
+    'bounds': [1.5, float('inf'), 3],
+    'topic': 'café',
+}
+
+
+@pytest.fixture
+def stdlib_only(monkeypatch):
+    monkeypatch.setattr(responses, 'orjson', None)
+
+
+def test_stdlib_fallback_writes_valid_json(stdlib_only):
+    decoded = json.loads(responses.dumps(PAYLOAD))
+    assert decoded == {
+        'updated_at': '2024-05-01T12:30:05',
+        'confidence': None,
+        'bounds': [1.5, None, 3],
+        'topic': 'café',
+    }
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    orjson = pytest.importorskip('orjson')
+    monkeypatch.setattr(responses, 'orjson', orjson)
+    fast = responses.dumps(PAYLOAD)
+    monkeypatch.setattr(responses, 'orjson', None)
+    assert responses.dumps(PAYLOAD) == fast
+
+
+def test_negotiate_encoding_honours_q_zero():
+    assert responses.negotiate_encoding('gzip;q=0, identity') is None
+    assert responses.negotiate_encoding('gzip, deflate') in ('gzip', 'br')
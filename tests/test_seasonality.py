@@ -0,0 +1,33 @@
+import numpy as np
+
+from utilis import TrendPredictor
+from utilis.seasonality import SeasonalityDetector
+
+
+def test_weekly_cycle_detected_on_daily_series():
+    days = np.arange(8 * 7)
+    values = 1000 + 300 * (days % 7 == 5)
+    assert SeasonalityDetector().detect(values)[0] == 7
+
+
+def test_candidate_periods_follow_interval():
+    assert TrendPredictor('day').seasonality.candidate_periods.tolist() == [7]
+    assert TrendPredictor('hour').seasonality.candidate_periods.tolist() == [24, 168]
+
+
+def test_trending_hourly_series_has_no_seven_hour_cycle():
+    hours = np.arange(200)
+    values = (1000 + 50 * hours).tolist()
+    assert TrendPredictor('hour').detect_seasonality(values) is None
+
+
+def test_daily_cycle_detected_on_hourly_series():
+    hours = np.arange(24 * 6)
+    values = (1000 + 500 * np.sin(2 * np.pi * hours / 24)).tolist()
+    assert TrendPredictor('hour').detect_seasonality(values) == 24
+
+
+def test_weekly_cycle_detected_on_rising_daily_series():
+    days = np.arange(8 * 7)
+    values = 1000 + 40 * days + 300 * (days % 7 == 5)
+    assert TrendPredictor('day').detect_seasonality(values.tolist()) == 7
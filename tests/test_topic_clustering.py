@@ -0,0 +1,59 @@
+import pytest
+
+from utilis.topic_clustering import TopicClusterer, normalize_text
+
+
+@pytest.mark.parametrize('first, second', [
+    ("world cup 2022", "World Cup 2026"),
+    ("dance challenge 2024", "dance challenge 2025"),
+    ("topic 1", "topic 4"),
+    ("topic 12", "topic 13"),
+    ("Recipe Tutorial Trend", "Sports Championship"),
+])
+def test_distinct_topics_stay_apart(first, second):
+    clusterer = TopicClusterer()
+    assert clusterer.assign(first) != clusterer.assign(second)
+
+
+@pytest.mark.parametrize('first, second', [
+    ("Dance Challenge 2024", "dance challenge 2024!!"),
+    ("Dance Challenge 2024", "DANCE CHALLENGE 2024 🔥"),
+    ("Dance Challenge 2024", "dance-challenge 2024"),
+    ("Tech News Update", "tech news update..."),
+    ("Morning Routine Challenge", "#Morning Routine Challenge"),
+])
+def test_punctuation_and_case_variants_merge(first, second):
+    clusterer = TopicClusterer()
+    assert clusterer.assign(first) == clusterer.assign(second)
+
+
+def test_suffix_variant_joins_founder():
+    clusterer = TopicClusterer()
+    founder = clusterer.assign("Sustainable Fashion Week Highlights", ["fashion"])
+    assert clusterer.assign("sustainable fashion week highlights fyp", ["fashion"]) == founder
+    assert clusterer.label(founder) == "sustainable fashion week highlights"
+
+
+def test_cluster_ids_are_stable():
+    first, second = TopicClusterer(), TopicClusterer()
+    assert first.assign("Music Festival Updates") == second.assign("Music Festival Updates")
+    assert len(first) == 1
+
+
+def test_normalize_text():
+    assert normalize_text("  Dance-Challenge!!  2024 ") == "dance challenge 2024"
+
+
+
+@pytest.mark.parametrize('sibling, founder, variant', [
+    ("dance challenge 2024", "dance challenge 2025", "dance challenge 2025 fyp"),
+    ("final world 2007", "final world 2008", "final world 2008 LIVE"),
+    ("music workout 2014", "music workout 2015", "music workout 2015 fyp"),
+    ("challenge music 2020", "challenge music 2021", "challenge music 2021 LIVE"),
+])
+def test_numbered_sibling_does_not_shadow_variant(sibling, founder, variant):
+    clusterer = TopicClusterer()
+    sibling_id = clusterer.assign(sibling)
+    founder_id = clusterer.assign(founder)
+    assert founder_id != sibling_id
+    assert clusterer.assign(variant) == founder_id
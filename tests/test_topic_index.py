@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from utilis import TrendPredictor
+from utilis.topic_index import TopicIndex
+
+
+def test_observations_outside_window_are_dropped():
+    index = TopicIndex(window_days=30)
+    now = datetime.utcnow()
+    for hours in range(60 * 24 - 3, -1, -6):  # Offset so nothing sits on the window boundary
+        index.add("Dance Challenge 2024", now - timedelta(hours=hours), 1000)
+
+    location = index._aliases['dance challenge 2024']
+    assert len(index._timestamps[location]) == 30 * 4
+    assert len(index._views[location]) == 30 * 4
+
+
+def test_late_observations_keep_series_sorted():
+    index = TopicIndex()
+    now = datetime.utcnow()
+    for days in (1, 3, 2, 0):
+        index.add("Tech News Update", now - timedelta(days=days), 100 * days)
+
+    location = index._aliases['tech news update']
+    assert list(index._timestamps[location]) == sorted(index._timestamps[location])
+    assert list(index._views[location]) == [300, 200, 100, 0]
+
+
+def test_forecast_uses_shared_predictor_labels():
+    predictor = TrendPredictor()
+    predictor.clusterer.assign("Dance Challenge 2024")
+    index = TopicIndex(predictor)
+    now = datetime.utcnow()
+    for days in range(10, -1, -1):
+        index.add("dance challenge 2024!!", now - timedelta(days=days), 1000 + 100 * (10 - days))
+
+    label, predictions = index.forecast("Dance Challenge 2024")
+    assert label == "dance challenge 2024"
+    assert len(predictions) == 7
+    assert index.forecast("unknown topic") is None
+
+
+def test_out_of_window_observation_registers_no_topic():
+    index = TopicIndex(window_days=30)
+    index.add("Dance Challenge 2024", datetime.utcnow() - timedelta(days=40), 1000)
+
+    assert len(index) == 0
+    assert index.forecast("Dance Challenge 2024") is None
+
+
+def test_forecast_memo_expires_when_observations_age_out():
+    index = TopicIndex(window_days=30)
+    now = datetime.utcnow()
+    for days in range(20, -1, -1):
+        index.add("Tech News Update", now - timedelta(days=days, hours=3), 1000 + 100 * (20 - days))
+
+    location = index._aliases['tech news update']
+    index.forecast("Tech News Update")
+    version = index._memo[location][0]
+
+    index.window_days = 10  # The oldest observations are now outside the window
+    index.forecast("Tech News Update")
+    assert len(index._timestamps[location]) == 10
+    assert index._memo[location][0] != version
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from utilis import TrendPredictor, TrendSeries
+
+
+def daily_rows(text, views):
+    start = datetime(2024, 1, 1)
+    return [{'text': text, 'hashtags': [], 'view_count': v,
+             'timestamp': (start + timedelta(days=d, hours=d % 5)).strftime('%Y-%m-%d %H:%M:%S')}
+            for d, v in enumerate(views)]
+
+
+def reference_smoothing(values, alpha):
+    result = [float(values[0])]
+    for value in values[1:]:
+        result.append(alpha * value + (1 - alpha) * result[-1])
+    return [int(v) for v in result]
+
+
+def test_exponential_smoothing_matches_recurrence():
+    predictor = TrendPredictor()
+    values = np.random.default_rng(0).integers(0, 10**6, 500)
+    # Alphas near 1 leave a tiny decay whose inverse powers overflow in long blocks
+    for alpha in (0.0, 0.05, 0.3, 0.9, 0.999, 0.99999, 1 - 2 ** -53, 1.0):
+        predictor.alpha = alpha
+        smoothed = predictor.exponential_smoothing(values)
+        assert np.abs(smoothed - reference_smoothing(values.tolist(), alpha)).max() <= 1
+
+
+def test_exponential_smoothing_rejects_alpha_outside_unit_interval():
+    predictor = TrendPredictor()
+    for alpha in (-0.1, 1.5):
+        predictor.alpha = alpha
+        with pytest.raises(ValueError):
+            predictor.exponential_smoothing(np.arange(10))
+
+
+def test_topic_series_stay_arrays():
+    predictor = TrendPredictor()
+    rows = daily_rows("Dance Challenge 2024", range(1000, 1300, 10)) + daily_rows("Tech News Update", [5, 6])
+    prepared = predictor.prepare_topic_series(rows)
+    series = prepared["dance challenge 2024"]
+    assert isinstance(series, TrendSeries)
+    assert series.view_counts.dtype == np.int64 and series.timestamps.dtype == np.dtype('datetime64[s]')
+    assert len(series) == 30
+
+
+def test_predictions_follow_linear_trend():
+    predictor = TrendPredictor()
+    predictions = predictor.predict_next_trends(daily_rows("x", range(1000, 4000, 100)))
+    assert [p['date'] for p in predictions][:2] == ['2024-01-31', '2024-02-01']
+    views = [p['predicted_views'] for p in predictions]
+    assert views == sorted(views) and views[0] > 3000
+
+
+def test_one_bad_topic_does_not_empty_forecast(monkeypatch):
+    predictor = TrendPredictor()
+    original = predictor.forecast_series
+
+    def flaky(series, *args, **kwargs):
+        if series.view_counts[0] == 7:
+            raise ValueError("boom")
+        return original(series, *args, **kwargs)
+
+    monkeypatch.setattr(predictor, 'forecast_series', flaky)
+    rows = daily_rows("Dance Challenge 2024", range(1000, 1300, 10)) + daily_rows("Tech News Update", [7] * 20)
+    assert list(predictor.get_trending_topics_forecast(rows)) == ["dance challenge 2024"]
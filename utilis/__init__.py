@@ -1,143 +1,266 @@
 import logging
-from datetime import datetime, timedelta
-from statistics import mean, stdev
+from array import array
 import numpy as np
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Iterable, Optional, Sequence, Union, Any
 from dataclasses import dataclass
+from .seasonality import PERIODS_BY_INTERVAL, SeasonalityDetector
+from .resampling import TimeResampler
+from .topic_clustering import TopicClusterer
 
 logger = logging.getLogger(__name__)
 
 @dataclass
 class TrendData:
+    __slots__ = ('timestamp', 'view_count')
     timestamp: str
     view_count: int
 
 @dataclass
 class PredictionResult:
+    __slots__ = ('date', 'predicted_views', 'confidence', 'upper_bound', 'lower_bound')
     date: str
     predicted_views: int
     confidence: float
     upper_bound: int
     lower_bound: int
 
+class TrendSeries:
+    """Struct-of-arrays observations: 16 bytes per point instead of a dict per point"""
+    __slots__ = ('timestamps', 'view_counts')
+
+    def __init__(self, timestamps: np.ndarray, view_counts: np.ndarray):
+        self.timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+        self.view_counts = np.asarray(view_counts, dtype=np.int64)
+
+    @classmethod
+    def from_records(cls, records: List[Union[Dict[str, Any], TrendData]]) -> 'TrendSeries':
+        """Build from {'timestamp', 'view_count'} dicts or TrendData records"""
+        if records and isinstance(records[0], TrendData):
+            timestamps = [r.timestamp for r in records]
+            view_counts = [r.view_count or 0 for r in records]
+        else:
+            timestamps = [r['timestamp'] for r in records]
+            view_counts = [r['view_count'] or 0 for r in records]
+        return cls(np.array(timestamps, dtype='datetime64[s]'), np.array(view_counts, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.view_counts)
+
+    def __getitem__(self, index: slice) -> 'TrendSeries':
+        """Slice both columns together; the result shares memory with this series"""
+        return TrendSeries(self.timestamps[index], self.view_counts[index])
+
+class ForecastBatch:
+    """Struct-of-arrays forecast points; dicts are only built at the JSON boundary"""
+    __slots__ = ('dates', 'predicted_views', 'confidence', 'upper_bound', 'lower_bound', 'date_format')
+
+    def __init__(self, dates: np.ndarray, predicted_views: np.ndarray, confidence: np.ndarray,
+                 upper_bound: np.ndarray, lower_bound: np.ndarray, date_format: str = '%Y-%m-%d'):
+        self.dates = dates
+        self.predicted_views = predicted_views
+        self.confidence = confidence
+        self.upper_bound = upper_bound
+        self.lower_bound = lower_bound
+        self.date_format = date_format
+
+    def __len__(self) -> int:
+        return len(self.predicted_views)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                'date': date.strftime(self.date_format),
+                'predicted_views': predicted,
+                'confidence': round(confidence, 2),
+                'upper_bound': upper,
+                'lower_bound': lower
+            }
+            for date, predicted, confidence, upper, lower in zip(
+                self.dates.astype('datetime64[s]').tolist(), self.predicted_views.tolist(),
+                self.confidence.tolist(), self.upper_bound.tolist(), self.lower_bound.tolist()
+            )
+        ]
+
 class TrendPredictor:
-    def __init__(self):
-        self.sequence_length = 7  # Number of days to look back
+    def __init__(self, interval: str = 'day', aggregation: str = 'last', fill: str = 'ffill'):
+        self.sequence_length = 7  # Number of buckets to look back
         self.alpha = 0.3  # Smoothing factor for exponential smoothing
+        # Only cycles that make sense at the bucket size, e.g. no 7-hour "week" on hourly data
+        self.seasonality = SeasonalityDetector(PERIODS_BY_INTERVAL[interval])
+        self.resampler = TimeResampler(interval, aggregation, fill)
+        self.clusterer = TopicClusterer()
 
-    def prepare_data(self, trends_data: List[Dict[str, Any]]) -> tuple[Optional[List[datetime]], Optional[List[int]]]:
-        """Prepare time series data for prediction"""
+    def prepare_data(self, trends_data: Union[List[Dict[str, Any]], TrendSeries]) -> Optional[TrendSeries]:
+        """Prepare time series data for prediction, one point per resampling bucket"""
         try:
             if not trends_data or len(trends_data) < 2:
                 logger.warning("Insufficient data for prediction")
-                return None, None
+                return None
 
-            # Convert trends data to list
-            dates = [datetime.strptime(t['timestamp'], '%Y-%m-%d %H:%M:%S') for t in trends_data]
-            values = [t['view_count'] for t in trends_data]
-
-            return dates, values
+            series = trends_data if isinstance(trends_data, TrendSeries) else TrendSeries.from_records(trends_data)
+            return self.prepare_arrays(series.timestamps, series.view_counts)
         except Exception as e:
             logger.error(f"Error preparing data: {str(e)}")
-            return None, None
+            return None
+
+    def prepare_arrays(self, timestamps: np.ndarray, view_counts: np.ndarray) -> Optional[TrendSeries]:
+        """Resample raw observation arrays into one point per bucket"""
+        # Observations arrive on every poll, so bucket them before smoothing
+        buckets, bucket_values = self.resampler.resample(timestamps, view_counts)
+        if len(bucket_values) < 2:
+            logger.debug("Observations fall into a single bucket, nothing to forecast")
+            return None
+
+        return TrendSeries(buckets, np.rint(bucket_values))
 
-    def exponential_smoothing(self, values: List[int]) -> List[int]:
+    def exponential_smoothing(self, values: np.ndarray) -> np.ndarray:
         """Apply exponential smoothing to the time series"""
-        result: List[int] = [values[0]]  # Initialize with first value
-        for n in range(1, len(values)):
-            # Convert float result to int
-            smoothed_value = int(self.alpha * values[n] + (1 - self.alpha) * result[n-1])
-            result.append(smoothed_value)
-        return result
-
-    def calculate_confidence_intervals(self, values: List[int], smoothed_values: List[int]) -> tuple[List[int], List[int]]:
+        if not 0 <= self.alpha <= 1:
+            raise ValueError("alpha must be between 0 and 1")
+
+        values = np.asarray(values, dtype=np.float64)
+        decay = 1 - self.alpha
+        if decay == 0 or len(values) < 2:
+            return values.astype(np.int64)
+
+        # s[n] = decay**n * (s[0] + alpha * sum(v[k] / decay**k)), evaluated in blocks
+        # short enough that decay**-k stays below 1e100. The smallest nonzero float
+        # decay (about 1e-16) still allows blocks of 6
+        block_size = 64 if decay > 0.01 else int(100 / -np.log10(decay))
+        result = np.empty_like(values)
+        result[0] = values[0]
+        for start in range(1, len(values), block_size):
+            block = values[start:start + block_size]
+            powers = decay ** np.arange(1, len(block) + 1)
+            result[start:start + len(block)] = powers * (result[start - 1] + self.alpha * np.cumsum(block / powers))
+        return result.astype(np.int64)
+
+    def calculate_confidence_intervals(self, values: np.ndarray, smoothed_values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
         """Calculate upper and lower confidence bounds"""
-        residuals = [v - s for v, s in zip(values, smoothed_values)]
-        std_dev = int(stdev(residuals)) if len(residuals) > 1 else abs(mean(residuals)) if residuals else 0
+        residuals = np.asarray(values, dtype=np.int64) - smoothed_values
+        std_dev = int(np.std(residuals, ddof=1)) if len(residuals) > 1 else abs(int(residuals.sum())) if len(residuals) else 0
 
-        upper_bounds = [int(s + 2 * std_dev) for s in smoothed_values]
-        lower_bounds = [max(0, int(s - 2 * std_dev)) for s in smoothed_values]
+        upper_bounds = smoothed_values + 2 * std_dev
+        lower_bounds = np.maximum(0, smoothed_values - 2 * std_dev)
 
         return upper_bounds, lower_bounds
 
-    def detect_seasonality(self, values: List[int]) -> Optional[int]:
+    def detect_seasonality(self, values: Sequence[int]) -> Optional[int]:
         """Detect seasonal patterns in the data"""
-        if len(values) < 14:  # Need at least 2 weeks of data
-            return None
+        period, _ = self.seasonality.detect(values)
+        return period
 
-        # Simple autocorrelation for weekly patterns
-        weekly_correlation = float(np.corrcoef(values[7:], values[:-7])[0,1])
-        return 7 if abs(weekly_correlation) > 0.7 else None
+    def detect_seasonality_batch(self, series: Sequence[Sequence[int]]) -> List[Optional[int]]:
+        """Detect seasonal patterns for many series with a single FFT pass"""
+        if not len(series):
+            return []
+        periods, _ = self.seasonality.detect_batch(series)
+        return [int(p) or None for p in periods]
 
-    def predict_next_trends(self, current_trends: List[Dict[str, Any]], days_ahead: int = 7) -> List[Dict[str, Any]]:
-        """Predict trend metrics for the next n days using exponential smoothing"""
+    def predict_next_trends(self, current_trends: Union[List[Dict[str, Any]], TrendSeries], days_ahead: int = 7,
+                            seasonal_period: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Predict trend metrics for the next n buckets (days by default) using exponential smoothing"""
         try:
-            dates, values = self.prepare_data(current_trends)
-            if not dates or not values or len(values) < 2:
+            series = self.prepare_data(current_trends)
+            if series is None or len(series) < 2:
                 return []
 
-            # Apply exponential smoothing
-            smoothed_values = self.exponential_smoothing(values)
-
-            # Detect seasonality
-            seasonal_period = self.detect_seasonality(values)
-
-            # Calculate recent trend
-            recent_changes = [smoothed_values[i] - smoothed_values[i-1] 
-                            for i in range(max(1, len(smoothed_values)-self.sequence_length), len(smoothed_values))]
-            recent_change = int(mean(recent_changes))
-
-            predictions = []
-            last_value = smoothed_values[-1]
-            upper_bounds, lower_bounds = self.calculate_confidence_intervals(values, smoothed_values)
-
-            for i in range(days_ahead):
-                # Predict next value considering seasonality if detected
-                if seasonal_period and len(values) >= seasonal_period:
-                    seasonal_factor = values[-seasonal_period + (i % seasonal_period)] / max(1, values[-seasonal_period])
-                    predicted_value = max(0, int((last_value + recent_change * (i + 1)) * seasonal_factor))
-                else:
-                    predicted_value = max(0, int(last_value + recent_change * (i + 1)))
-
-                # Calculate prediction interval
-                std_range = upper_bounds[-1] - lower_bounds[-1]
-                confidence = 100 * (1 - min(1, (i/days_ahead + std_range/max(1, predicted_value)/4)))
-
-                pred_date = dates[-1] + timedelta(days=i+1)
-
-                predictions.append({
-                    'date': pred_date.strftime('%Y-%m-%d'),
-                    'predicted_views': predicted_value,
-                    'confidence': round(max(0, min(100, confidence)), 2),
-                    'upper_bound': int(predicted_value + std_range/2),
-                    'lower_bound': max(0, int(predicted_value - std_range/2))
-                })
-
-            return predictions
+            return self.forecast_series(series, days_ahead, seasonal_period)
         except Exception as e:
             logger.error(f"Error making predictions: {str(e)}")
             return []
 
-    def get_trending_topics_forecast(self, historical_trends: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def forecast_series(self, series: TrendSeries, days_ahead: int = 7,
+                        seasonal_period: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Forecast an already resampled series"""
+        return self.forecast_arrays(series, days_ahead, seasonal_period).to_dicts()
+
+    def forecast_arrays(self, series: TrendSeries, days_ahead: int = 7,
+                        seasonal_period: Optional[int] = None) -> ForecastBatch:
+        """Forecast an already resampled series into a compact ForecastBatch"""
+        values = series.view_counts
+
+        # Apply exponential smoothing
+        smoothed_values = self.exponential_smoothing(values)
+
+        # Detect seasonality unless the caller already did it for a batch
+        if seasonal_period is None:
+            seasonal_period = self.detect_seasonality(values)
+
+        # Calculate recent trend
+        recent_changes = np.diff(smoothed_values[max(0, len(smoothed_values) - self.sequence_length - 1):])
+        recent_change = int(recent_changes.mean())
+
+        last_value = smoothed_values[-1]
+        upper_bounds, lower_bounds = self.calculate_confidence_intervals(values, smoothed_values)
+
+        steps = np.arange(days_ahead)
+        trend_values = last_value + recent_change * (steps + 1)
+        # Predict next values considering seasonality if detected
+        if seasonal_period and len(values) >= seasonal_period:
+            history = values[-seasonal_period:].astype(np.float64)
+            seasonal_factors = history[steps % seasonal_period] / max(1, values[-seasonal_period])
+            predicted = np.maximum(0, np.trunc(trend_values * seasonal_factors)).astype(np.int64)
+        else:
+            predicted = np.maximum(0, trend_values).astype(np.int64)
+
+        # Calculate prediction interval
+        std_range = upper_bounds[-1] - lower_bounds[-1]
+        confidence = 100 * (1 - np.minimum(1, steps / days_ahead + std_range / np.maximum(1, predicted) / 4))
+
+        return ForecastBatch(
+            dates=series.timestamps[-1] + np.timedelta64(self.resampler.step) * (steps + 1),
+            predicted_views=predicted,
+            confidence=np.clip(confidence, 0, 100),
+            upper_bound=np.trunc(predicted + std_range / 2).astype(np.int64),
+            lower_bound=np.maximum(0, np.trunc(predicted - std_range / 2)).astype(np.int64),
+            date_format=self.resampler.date_format
+        )
+
+    def prepare_topic_series(self, historical_trends: Iterable[Dict[str, Any]]) -> Dict[str, TrendSeries]:
+        """Group observations by topic cluster and resample each topic into a series"""
+        # Group trends by near-duplicate topic cluster, labelled by the cluster's founding text.
+        # Rows are consumed one at a time into flat arrays, so callers can stream them.
+        topic_ids: Dict[str, int] = {}
+        topic_column, seconds_column, views_column = array('q'), array('q'), array('q')
+        for trend in historical_trends:
+            cluster_id = self.clusterer.assign(trend['text'], trend.get('hashtags'))
+            topic_column.append(topic_ids.setdefault(self.clusterer.label(cluster_id), len(topic_ids)))
+            seconds_column.append(int(np.datetime64(trend['timestamp'], 's').astype(np.int64)))
+            views_column.append(trend['view_count'] or 0)
+
+        topics = np.array(topic_column, dtype=np.int64)
+        order = np.argsort(topics, kind='stable')
+        bounds = np.searchsorted(topics[order], np.arange(len(topic_ids) + 1))
+        observations = TrendSeries(np.array(seconds_column, dtype=np.int64)[order].astype('datetime64[s]'),
+                                   np.array(views_column, dtype=np.int64)[order])
+
+        # Resample every topic, keeping those with at least 2 buckets
+        prepared = {}
+        for topic, index in topic_ids.items():
+            start, end = bounds[index], bounds[index + 1]
+            if end - start >= 2:
+                series = self.prepare_data(observations[start:end])
+                if series is not None:
+                    prepared[topic] = series
+        return prepared
+
+    def get_trending_topics_forecast(self, historical_trends: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Analyze and forecast trending topics"""
         try:
-            # Group trends by topic
-            topic_trends: Dict[str, List[Dict[str, Any]]] = {}
-            for trend in historical_trends:
-                topic = trend['text'].lower()
-                if topic not in topic_trends:
-                    topic_trends[topic] = []
-                topic_trends[topic].append({
-                    'timestamp': trend['timestamp'],
-                    'view_count': trend['view_count']
-                })
+            prepared = self.prepare_topic_series(historical_trends)
+            periods = self.detect_seasonality_batch([series.view_counts for series in prepared.values()])
 
             forecasts = {}
-            for topic, trends in topic_trends.items():
-                if len(trends) >= 2:  # Need at least 2 points for prediction
-                    predictions = self.predict_next_trends(trends)
-                    if predictions:
-                        forecasts[topic] = predictions
+            for (topic, series), period in zip(prepared.items(), periods):
+                # One bad series must not cost every other topic its forecast
+                try:
+                    predictions = self.forecast_series(series, seasonal_period=period or 0)
+                except Exception as e:
+                    logger.error(f"Error forecasting topic {topic}: {str(e)}")
+                    continue
+                if predictions:
+                    forecasts[topic] = predictions
 
             return forecasts
         except Exception as e:
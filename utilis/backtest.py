@@ -0,0 +1,145 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import TrendPredictor, TrendSeries
+
+logger = logging.getLogger(__name__)
+
+
+def score_forecasts(predicted: np.ndarray, actual: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                    groups: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    """Per-group error sums for a flat batch of forecast points.
+
+    Sums rather than means are returned so chunks can be merged exactly before
+    computing MAE, MAPE and interval coverage.
+    """
+    errors = np.abs(predicted - actual)
+    nonzero = actual > 0
+    pct_errors = np.divide(errors, actual, out=np.zeros_like(errors), where=nonzero)
+    covered = (actual >= lower) & (actual <= upper)
+
+    return {
+        'points': np.bincount(groups, minlength=n_groups),
+        'abs_error': np.bincount(groups, weights=errors, minlength=n_groups),
+        'pct_error': np.bincount(groups, weights=pct_errors, minlength=n_groups),
+        'pct_points': np.bincount(groups, weights=nonzero, minlength=n_groups),
+        'covered': np.bincount(groups, weights=covered, minlength=n_groups),
+    }
+
+
+def summarize(sums: Dict[str, Any]) -> Dict[str, float]:
+    """Turn (possibly merged) error sums into MAE, MAPE and coverage"""
+    points = float(np.sum(sums['points']))
+    pct_points = float(np.sum(sums['pct_points']))
+    return {
+        'points': int(points),
+        'mae': round(float(np.sum(sums['abs_error'])) / points, 2) if points else None,
+        'mape': round(100 * float(np.sum(sums['pct_error'])) / pct_points, 2) if pct_points else None,
+        'coverage': round(float(np.sum(sums['covered'])) / points, 4) if points else None,
+    }
+
+
+def _evaluate_chunk(task: Tuple[Dict[str, Any], List[str], List[TrendSeries], Dict[str, Any]]):
+    """Walk-forward evaluate one parameter point over a chunk of topics (runs in a worker)"""
+    params, topics, series, options = task
+    predictor = TrendPredictor(options['interval'])
+    predictor.alpha = params['alpha']
+    predictor.sequence_length = params['sequence_length']
+    horizon, min_train, step = options['horizon'], options['min_train'], options['step']
+
+    predicted, lower, upper, actual, groups = [], [], [], [], []
+    forecasts = 0
+    for index, topic_series in enumerate(series):
+        values = topic_series.view_counts
+        origins = range(min_train, len(values) - horizon + 1, step)
+        # Every split's training prefix goes through one batched seasonality pass
+        periods = predictor.detect_seasonality_batch([values[:origin] for origin in origins])
+        for origin, period in zip(origins, periods):
+            # Same forecasting path as predict_next_trends, minus re-parsing rows and building dicts
+            batch = predictor.forecast_arrays(topic_series[:origin], horizon, seasonal_period=period or 0)
+            predicted.append(batch.predicted_views)
+            lower.append(batch.lower_bound)
+            upper.append(batch.upper_bound)
+            actual.append(values[origin:origin + horizon])
+            groups.append(np.full(horizon, index, dtype=np.int64))
+            forecasts += 1
+
+    if not forecasts:
+        empty = np.zeros(0)
+        return params, topics, score_forecasts(empty, empty, empty, empty, empty.astype(np.int64), len(series)), 0
+
+    sums = score_forecasts(
+        np.concatenate(predicted).astype(np.float64), np.concatenate(actual).astype(np.float64),
+        np.concatenate(lower).astype(np.float64), np.concatenate(upper).astype(np.float64),
+        np.concatenate(groups), len(series)
+    )
+    return params, topics, sums, forecasts
+
+
+def run_backtest(topic_series: Dict[str, TrendSeries], alphas: Sequence[float], sequence_lengths: Sequence[int],
+                 horizon: int = 7, min_train: int = 14, step: int = 1, interval: str = 'day',
+                 workers: Optional[int] = None, chunk_size: int = 200) -> Dict[str, Any]:
+    """Score every (alpha, sequence_length) grid point with walk-forward splits over every topic"""
+    if min_train < 2:
+        raise ValueError("min_train must be at least 2")
+    if not all(0 <= alpha <= 1 for alpha in alphas):
+        raise ValueError("alpha must be between 0 and 1")
+
+    # Topics too short for a single split are skipped up front
+    eligible = {topic: s for topic, s in topic_series.items() if len(s) >= min_train + horizon}
+    topics = list(eligible)
+    grid = [{'alpha': a, 'sequence_length': n} for a, n in product(alphas, sequence_lengths)]
+    options = {'horizon': horizon, 'min_train': min_train, 'step': step, 'interval': interval}
+
+    tasks = []
+    for params in grid:
+        for start in range(0, len(topics), chunk_size):
+            chunk = topics[start:start + chunk_size]
+            tasks.append((params, chunk, [eligible[t] for t in chunk], options))
+
+    results = {(p['alpha'], p['sequence_length']): {'params': p, 'topics': {}, 'forecasts': 0} for p in grid}
+    total_points = 0
+    started = time.perf_counter()
+    logger.info(f"Backtesting {len(grid)} grid points over {len(topics)} topics in {len(tasks)} tasks")
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [executor.submit(_evaluate_chunk, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            params, chunk_topics, sums, forecasts = future.result()
+            entry = results[(params['alpha'], params['sequence_length'])]
+            entry['forecasts'] += forecasts
+            for index, topic in enumerate(chunk_topics):
+                entry['topics'][topic] = {name: values[index] for name, values in sums.items()}
+            total_points += int(sums['points'].sum())
+
+            elapsed = time.perf_counter() - started
+            logger.info(f"[{done}/{len(tasks)}] {total_points:,} points scored, "
+                        f"{total_points / max(elapsed, 1e-9):,.0f} points/s")
+
+    elapsed = time.perf_counter() - started
+    report = []
+    for entry in results.values():
+        topic_sums = entry['topics'].values()
+        merged = {name: [s[name] for s in topic_sums] for name in ('points', 'abs_error', 'pct_error', 'pct_points', 'covered')}
+        report.append({
+            **entry['params'],
+            **summarize(merged),
+            'forecasts': entry['forecasts'],
+            'topics': {topic: summarize(s) for topic, s in entry['topics'].items()},
+        })
+
+    report.sort(key=lambda r: float('inf') if r['mae'] is None else r['mae'])
+    return {
+        'grid': report,
+        'topics_evaluated': len(topics),
+        'topics_skipped': len(topic_series) - len(topics),
+        'points_scored': total_points,
+        'elapsed_seconds': round(elapsed, 2),
+        'points_per_second': round(total_points / elapsed, 1) if elapsed else None,
+    }
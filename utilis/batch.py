@@ -0,0 +1,273 @@
+import csv
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from . import TrendPredictor
+from .trend_analyser import TrendAnalyzer
+from .topic_clustering import normalize_text
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_SECONDS = {'hour': 3600, 'day': 86400}
+FORECAST_CHUNK = 500  # Topics per forecasting task
+
+_analyzer: Optional[TrendAnalyzer] = None
+
+
+def read_posts(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Stream posts from NDJSON or CSV files; '-' reads NDJSON from stdin"""
+    for path in paths:
+        if path == '-':
+            yield from _read_ndjson(sys.stdin)
+            continue
+        with open(path, encoding='utf-8', newline='') as f:
+            if path.lower().endswith('.csv'):
+                yield from csv.DictReader(f)
+            else:
+                yield from _read_ndjson(f)
+
+
+def _read_ndjson(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # An empty post is counted as skipped downstream instead of ending the job
+            logger.warning(f"Skipping unparseable line {number}")
+            yield {}
+
+
+def parse_hashtags(value: Any) -> List[str]:
+    """Hashtags arrive as a JSON list, or in CSV as a JSON string or '#a #b' / 'a,b'"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(tag) for tag in value]
+    value = str(value).strip()
+    if value.startswith('['):
+        return [str(tag) for tag in json.loads(value)]
+    return [tag for tag in re.split(r'[\s,#]+', value) if tag]
+
+
+def post_views(post: Dict[str, Any]) -> int:
+    # Same fallbacks as the /api/trends ingest, plus exported view_count
+    for key in ('view_count', 'views', 'tweet_count'):
+        value = post.get(key)
+        if value not in (None, ''):
+            return int(float(value))
+    return 0
+
+
+def post_seconds(post: Dict[str, Any]) -> Optional[int]:
+    """Epoch seconds of the post's timestamp, None if it has none; raises ValueError if unparseable"""
+    timestamp = post.get('timestamp') or post.get('created_at')
+    if not timestamp:
+        return None
+    return int(np.datetime64(timestamp, 's').astype(np.int64))
+
+
+def _process_chunk(task: Tuple[List[Dict[str, Any]], int]):
+    """Count keywords and reduce observations to the latest reading per text and bucket (runs in a worker)"""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = TrendAnalyzer()
+
+    posts, bucket_seconds = task
+    keywords: Counter = Counter()
+    mentions: Counter = Counter()  # (normalized text, platform) -> posts
+    representatives: Dict[str, Tuple[str, List[str]]] = {}
+    latest: Dict[Tuple[str, int], Tuple[int, int]] = {}
+    skipped = 0
+
+    for post in posts:
+        text = post.get('text')
+        if not text:
+            skipped += 1
+            continue
+
+        # One malformed row is counted and skipped rather than failing the whole job
+        try:
+            hashtags = parse_hashtags(post.get('hashtags'))
+            seconds = post_seconds(post)
+            views = post_views(post)
+        except (ValueError, TypeError):
+            skipped += 1
+            continue
+
+        normalized = normalize_text(text)
+        representatives.setdefault(normalized, (text, hashtags))
+        keywords.update(_analyzer.extract_keywords(text))
+        mentions[(normalized, (post.get('platform') or 'unknown').lower())] += 1
+
+        if seconds is None:
+            continue
+        key = (normalized, seconds // bucket_seconds)
+        current = latest.get(key)
+        if current is None or seconds >= current[0]:
+            latest[key] = (seconds, views)
+
+    observations = [(normalized, bucket, seconds, views) for (normalized, bucket), (seconds, views) in latest.items()]
+    return len(posts), skipped, keywords, mentions, representatives, observations
+
+
+def _forecast_chunk(task: Tuple[str, List[Tuple[str, List[int], List[int]]]]):
+    """Forecast a chunk of topic series (runs in a worker)"""
+    interval, series = task
+    predictor = TrendPredictor(interval)
+
+    prepared = []
+    for topic, seconds, views in series:
+        resampled = predictor.prepare_arrays(
+            np.asarray(seconds, dtype=np.int64).astype('datetime64[s]'),
+            np.asarray(views, dtype=np.float64)
+        )
+        if resampled is not None:
+            prepared.append((topic, resampled))
+
+    periods = predictor.detect_seasonality_batch([resampled.view_counts for _, resampled in prepared])
+    results = []
+    for (topic, resampled), period in zip(prepared, periods):
+        predictions = predictor.forecast_series(resampled, seasonal_period=period or 0)
+        if predictions:
+            results.append((topic, predictions))
+    return results
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BatchPipeline:
+    """Stream posts through analysis and forecasting with a bounded number of chunks in flight.
+
+    Only the latest reading per topic and time bucket is kept between chunks (the
+    forecaster's default 'last' aggregation), so memory grows with topics x buckets,
+    not with the number of posts.
+    """
+
+    def __init__(self, interval: str = 'day', workers: Optional[int] = None, chunk_size: int = 5000,
+                 loader: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        self.interval = interval
+        self.bucket_seconds = INTERVAL_SECONDS[interval]
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.loader = loader  # Optional callback that persists each raw chunk
+
+        self.predictor = TrendPredictor(interval)
+        self.analyzer = TrendAnalyzer()
+        self.keywords: Counter = Counter()
+        self.platforms: Counter = Counter()
+        self.clusters: Dict[str, Dict[str, Any]] = {}
+        self.topics: Dict[str, Dict[int, Tuple[int, int]]] = {}  # Label -> bucket -> (seconds, views)
+
+        self.posts = 0
+        self.skipped = 0
+        self._started = 0.0
+
+    def _merge(self, result) -> None:
+        processed, skipped, keywords, mentions, representatives, observations = result
+        self.posts += processed
+        self.skipped += skipped
+        self.keywords.update(keywords)
+
+        clusterer = self.predictor.clusterer
+        labels = {}
+        for normalized, (text, hashtags) in representatives.items():
+            cluster_id = clusterer.assign(text, hashtags)
+            labels[normalized] = (cluster_id, clusterer.label(cluster_id))
+
+        for (normalized, platform), count in mentions.items():
+            self.platforms[platform] += count
+            cluster_id, label = labels[normalized]
+            cluster = self.clusters.setdefault(cluster_id, {
+                'cluster_id': cluster_id,
+                'topic': label,
+                'size': 0,
+                'platforms': {}
+            })
+            cluster['size'] += count
+            cluster['platforms'][platform] = cluster['platforms'].get(platform, 0) + count
+
+        for normalized, bucket, seconds, views in observations:
+            buckets = self.topics.setdefault(labels[normalized][1], {})
+            current = buckets.get(bucket)
+            if current is None or seconds >= current[0]:
+                buckets[bucket] = (seconds, views)
+
+        elapsed = time.perf_counter() - self._started
+        logger.info(f"{self.posts:,} posts, {len(self.topics):,} topics, {self.posts / max(elapsed, 1e-9):,.0f} posts/s")
+
+    def _forecast_tasks(self) -> Iterator[Tuple[str, List[Tuple[str, List[int], List[int]]]]]:
+        """Build forecast tasks lazily, releasing each topic's readings once its task exists"""
+        topics = list(self.topics)
+        for start in range(0, len(topics), FORECAST_CHUNK):
+            series = []
+            for topic in topics[start:start + FORECAST_CHUNK]:
+                readings = sorted(self.topics.pop(topic).values())
+                series.append((topic, [s for s, _ in readings], [v for _, v in readings]))
+            yield self.interval, series
+
+    @staticmethod
+    def _write_forecasts(results, forecasts_out: TextIO) -> int:
+        for topic, predictions in results:
+            forecasts_out.write(json.dumps({'topic': topic, 'predictions': predictions}) + "\n")
+        return len(results)
+
+    def run(self, posts: Iterable[Dict[str, Any]], forecasts_out: TextIO) -> Dict[str, Any]:
+        """Process every post, write one NDJSON forecast line per topic and return the analysis"""
+        self._started = time.perf_counter()
+        max_pending = self.workers * 2
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for chunk in _chunks(posts, self.chunk_size):
+                if self.loader:
+                    self.loader(chunk)
+                pending.append(executor.submit(_process_chunk, (chunk, self.bucket_seconds)))
+                # Backpressure: never read more than a few chunks ahead of the workers
+                while len(pending) >= max_pending:
+                    self._merge(pending.popleft().result())
+            while pending:
+                self._merge(pending.popleft().result())
+
+            topic_count = len(self.topics)
+            logger.info(f"Forecasting {topic_count:,} topics")
+            forecast_count = 0
+            # Same backpressure as ingest, so topic series are not all copied into queued tasks
+            for task in self._forecast_tasks():
+                pending.append(executor.submit(_forecast_chunk, task))
+                while len(pending) >= max_pending:
+                    forecast_count += self._write_forecasts(pending.popleft().result(), forecasts_out)
+            while pending:
+                forecast_count += self._write_forecasts(pending.popleft().result(), forecasts_out)
+
+        elapsed = time.perf_counter() - self._started
+        clusters = sorted(self.clusters.values(), key=lambda c: c['size'], reverse=True)
+        report = self.analyzer.build_report(self.keywords, dict(self.platforms), clusters)
+        report['batch'] = {
+            'posts': self.posts,
+            'skipped': self.skipped,
+            'topics': topic_count,
+            'forecasts': forecast_count,
+            'elapsed_seconds': round(elapsed, 2),
+            'posts_per_second': round(self.posts / elapsed, 1) if elapsed else None,
+        }
+        return report
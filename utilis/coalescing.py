@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent identical requests"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(endpoint: str, **params: Any) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+        """Key requests by endpoint and their (order-independent) parameters"""
+        return endpoint, tuple(sorted(params.items()))
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn once per key at a time; concurrent callers await the same result"""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            # Run as its own task so a disconnecting caller doesn't cancel it for everyone
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Coalescing request for {key}")
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'executions': self.executions,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'in_flight': len(self._inflight),
+            'coalesced_ratio': round(self.coalesced / self.calls, 4) if self.calls else 0.0
+        }
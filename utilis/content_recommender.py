@@ -1,5 +1,7 @@
 class ContentRecommender:
-    def __init__(self):
+    def __init__(self, hashtag_graph=None):
+        # Optional HashtagGraph; without one (or for unseen topics) hashtags come from templates
+        self.hashtag_graph = hashtag_graph
         # Mock content templates
         self.templates = {
             'video': [
@@ -42,12 +44,27 @@ class ContentRecommender:
             })
 
         # Generate hashtag recommendations
-        recommendations['hashtags'] = [
+        template_hashtags = [
             f"#{trend_topic.replace(' ', '')}",
             f"#{trend_topic.replace(' ', '_')}",
             '#trending',
             '#viral',
             f"#{trend_topic}challenge"
         ]
+        # Prefer tags actually used with the topic, topping up from the templates
+        hashtags = self.hashtag_graph.suggest(trend_topic, k=5) if self.hashtag_graph else []
+        if hashtags:
+            hashtags += [h for h in dict.fromkeys(template_hashtags) if h.lower() not in hashtags]
+            recommendations['hashtags'] = hashtags[:5]
+        else:
+            recommendations['hashtags'] = template_hashtags
 
         return recommendations
+
+    def get_batch_recommendations(self, trend_topics):
+        # One pass over the requested topics, skipping duplicates but keeping their order
+        batch = {}
+        for trend_topic in trend_topics:
+            if trend_topic and trend_topic not in batch:
+                batch[trend_topic] = self.get_recommendations(trend_topic)
+        return batch
@@ -0,0 +1,262 @@
+import logging
+import threading
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .topic_clustering import normalize_text
+
+logger = logging.getLogger(__name__)
+
+MAX_TAGS_PER_POST = 20  # Pairs grow quadratically, so tag-stuffed posts are capped
+
+
+def normalize_tag(tag: str) -> str:
+    """Lowercase and drop the leading '#' and any surrounding whitespace"""
+    return str(tag).strip().lstrip('#').strip().lower()
+
+
+class HashtagGraph:
+    """Time-decayed hashtag co-occurrence counts in a compact CSR matrix.
+
+    New pairs are summed into per-tag pending maps and merged into the CSR arrays
+    once `merge_threshold` distinct entries have accumulated. Decay uses a global scale
+    factor: an observation at time t is stored with weight 2**((t - origin) / half_life),
+    so old weights never have to be rewritten and per-tag rankings stay valid
+    as time passes. Top related tags are memoized per tag: the merged ranking until a
+    merge touches the tag, and the ranking with pending weights until the next merge,
+    updated in place as new pairs arrive.
+    """
+
+    def __init__(self, half_life_days: float = 7.0, merge_threshold: int = 200_000,
+                 min_weight: float = 0.01, cache_k: int = 20):
+        self.half_life = half_life_days * 86400
+        self.merge_threshold = merge_threshold
+        self.min_weight = min_weight  # Decayed weight below which merged entries are pruned
+        self.cache_k = cache_k
+
+        self._ids: Dict[str, int] = {}
+        self._tags: List[str] = []
+        self._topic_tags: Dict[str, Tuple[int, ...]] = {}  # Normalized topic text -> its latest tags
+
+        # CSR over tag ids; both (a, b) and (b, a) are stored so a row holds every neighbour
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int64)
+        self._data = np.zeros(0, dtype=np.float64)
+
+        # Unmerged weights per tag, folded into the CSR in bulk
+        self._pending: Dict[int, Dict[int, float]] = {}
+        self._pending_entries = 0
+
+        self._origin: Optional[float] = None  # Epoch seconds where the scale factor is 1
+        self._latest = 0.0
+        self._top: Dict[int, List[Tuple[int, float]]] = {}  # Merged weights only
+        self._related: Dict[int, List[Tuple[int, float]]] = {}  # Merged plus pending weights
+        self._lock = threading.Lock()
+
+    def _tag_id(self, tag: str) -> int:
+        tag_id = self._ids.get(tag)
+        if tag_id is None:
+            tag_id = len(self._tags)
+            self._ids[tag] = tag_id
+            self._tags.append(tag)
+        return tag_id
+
+    def _scale(self, seconds: float) -> float:
+        if self._origin is None:
+            self._origin = seconds
+        exponent = (seconds - self._origin) / self.half_life
+        if exponent > 64:
+            # Re-base before stored weights overflow; rankings are unaffected
+            factor = 2.0 ** -exponent
+            self._data *= factor
+            for weights in self._pending.values():
+                for other in weights:
+                    weights[other] *= factor
+            self._top = {tag_id: [(other, w * factor) for other, w in top] for tag_id, top in self._top.items()}
+            self._related.clear()
+            self._origin = seconds
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def add(self, hashtags: Optional[Iterable[str]], timestamp: Optional[datetime] = None,
+            text: Optional[str] = None) -> None:
+        """Record the hashtags used together on one post"""
+        tags = sorted({normalize_tag(tag) for tag in hashtags or []} - {''})[:MAX_TAGS_PER_POST]
+        if not tags:
+            return
+
+        seconds = float(np.datetime64(timestamp or datetime.utcnow(), 's').astype(np.int64))
+        with self._lock:
+            tag_ids = tuple(self._tag_id(tag) for tag in tags)
+            if text:
+                self._topic_tags[normalize_text(text)] = tag_ids
+
+            self._latest = max(self._latest, seconds)
+            weight = self._scale(seconds)
+            for tag_id in tag_ids:
+                weights = self._pending.setdefault(tag_id, {})
+                size = len(weights)
+                for other in tag_ids:
+                    if other != tag_id:
+                        weights[other] = weights.get(other, 0.0) + weight
+                self._pending_entries += len(weights) - size
+
+                related = self._related.get(tag_id)
+                if related is not None:
+                    for other in tag_ids:
+                        if other != tag_id:
+                            self._raise(tag_id, related, other, weight)
+
+            if self._pending_entries >= self.merge_threshold:
+                self._merge()
+
+    def flush(self) -> None:
+        """Merge pending entries now, e.g. after warming the graph from history"""
+        with self._lock:
+            self._merge()
+
+    def _merge(self) -> None:
+        """Fold pending entries into the CSR arrays (caller holds the lock)"""
+        if not self._pending:
+            return
+
+        n_tags = len(self._tags)
+        counts = np.diff(self._indptr)
+        pending, self._pending, n_pending = self._pending, {}, self._pending_entries
+        self._pending_entries = 0
+        self._related.clear()
+
+        rows = np.concatenate([
+            np.repeat(np.arange(len(counts), dtype=np.int64), counts),
+            np.repeat(np.fromiter(pending, dtype=np.int64, count=len(pending)),
+                      np.fromiter(map(len, pending.values()), dtype=np.int64, count=len(pending)))
+        ])
+        cols = np.concatenate([self._indices, np.fromiter(chain.from_iterable(pending.values()),
+                                                          dtype=np.int64, count=n_pending)])
+        weights = np.concatenate([self._data, np.fromiter(chain.from_iterable(w.values() for w in pending.values()),
+                                                          dtype=np.float64, count=n_pending)])
+
+        # Sum duplicate (row, col) pairs; the combined key sorts row-major
+        keys, inverse = np.unique(rows * n_tags + cols, return_inverse=True)
+        weights = np.bincount(inverse, weights=weights)
+
+        # Drop pairs whose decayed weight has become negligible
+        keep = weights >= self.min_weight * self._scale(self._latest)
+        keys, weights = keys[keep], weights[keep]
+        rows = keys // n_tags
+
+        self._indptr = np.zeros(n_tags + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_tags), out=self._indptr[1:])
+        self._indices = keys % n_tags
+        self._data = weights
+
+        if keep.all():
+            for tag_id in pending:
+                self._top.pop(tag_id, None)
+        else:
+            self._top.clear()
+
+    def _row(self, tag_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Merged neighbours of one tag, sorted by tag id (caller holds the lock)"""
+        if tag_id + 1 < len(self._indptr):
+            start, end = self._indptr[tag_id], self._indptr[tag_id + 1]
+            return self._indices[start:end], self._data[start:end]
+        return self._indices[:0], self._data[:0]
+
+    def _ranked(self, indices: np.ndarray, data: np.ndarray) -> List[Tuple[int, float]]:
+        if len(data) > self.cache_k:
+            best = np.argpartition(data, -self.cache_k)[-self.cache_k:]
+            indices, data = indices[best], data[best]
+        order = np.lexsort((indices, -data))  # Ties by tag id, whether or not entries are merged yet
+        return list(zip(indices[order].tolist(), data[order].tolist()))
+
+    def _merged_weight(self, tag_id: int, other: int) -> float:
+        indices, data = self._row(tag_id)
+        position = np.searchsorted(indices, other)
+        return float(data[position]) if position < len(indices) and indices[position] == other else 0.0
+
+    def _raise(self, tag_id: int, related: List[Tuple[int, float]], other: int, weight: float) -> None:
+        """Add a new pending weight to a memoized ranking in place (caller holds the lock).
+
+        Weights only grow between merges, so the only tag that can enter the ranking
+        is the one whose weight just grew, and it can only move up.
+        """
+        for i, (tag, score) in enumerate(related):
+            if tag == other:
+                related[i] = (other, score + weight)
+                break
+        else:
+            # A ranking shorter than cache_k already lists every neighbour with any weight
+            score = self._pending[tag_id][other]
+            if len(related) >= self.cache_k:
+                score += self._merged_weight(tag_id, other)
+                if (-score, other) >= (-related[-1][1], related[-1][0]):
+                    return
+                related.pop()
+            related.append((other, score))
+        related.sort(key=lambda entry: (-entry[1], entry[0]))
+
+    def _top_related(self, tag_id: int) -> List[Tuple[int, float]]:
+        """Top `cache_k` neighbours by stored weight (caller holds the lock)"""
+        top = self._top.get(tag_id)
+        if top is None:
+            top = self._top[tag_id] = self._ranked(*self._row(tag_id))
+
+        pending = self._pending.get(tag_id)
+        if not pending:
+            return top
+
+        related = self._related.get(tag_id)
+        if related is None:
+            # Only pending pairs and the merged top can rank: every other neighbour
+            # still has its merged weight, which no top entry falls below
+            cols = np.fromiter(pending, dtype=np.int64, count=len(pending))
+            weights = np.fromiter(pending.values(), dtype=np.float64, count=len(pending))
+            indices, data = self._row(tag_id)
+            if len(indices):
+                positions = np.minimum(np.searchsorted(indices, cols), len(indices) - 1)
+                merged = indices[positions] == cols
+                weights[merged] += data[positions[merged]]
+
+            top_cols = np.array([other for other, _ in top if other not in pending], dtype=np.int64)
+            top_weights = np.array([w for other, w in top if other not in pending], dtype=np.float64)
+            related = self._related[tag_id] = self._ranked(np.concatenate([cols, top_cols]),
+                                                           np.concatenate([weights, top_weights]))
+        return related
+
+    def related(self, tag: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Most frequent co-occurring tags, weighted as of the latest observation"""
+        with self._lock:
+            tag_id = self._ids.get(normalize_tag(tag))
+            if tag_id is None or self._origin is None:
+                return []
+            decay = 1 / self._scale(self._latest)
+            return [(self._tags[other], round(w * decay, 4)) for other, w in self._top_related(tag_id)[:k]]
+
+    def suggest(self, topic: str, k: int = 5) -> List[str]:
+        """Hashtags for a topic: the tags seen on it, then their strongest co-occurring tags"""
+        normalized = normalize_text(topic)
+        with self._lock:
+            seeds = list(self._topic_tags.get(normalized, ()))
+            # A topic typed by hand may itself be a tag, or contain tags as words
+            for candidate in [normalized.replace(' ', '')] + normalized.split():
+                tag_id = self._ids.get(candidate)
+                if tag_id is not None and tag_id not in seeds:
+                    seeds.append(tag_id)
+            if not seeds:
+                return []
+
+            scores: Dict[int, float] = {}
+            for seed in seeds:
+                for other, weight in self._top_related(seed):
+                    if other not in seeds:
+                        scores[other] = scores.get(other, 0.0) + weight
+
+            ranked = seeds + sorted(scores, key=scores.get, reverse=True)
+            return [f"#{self._tags[tag_id]}" for tag_id in ranked[:k]]
+
+    def __len__(self) -> int:
+        return len(self._tags)
@@ -0,0 +1,91 @@
+import logging
+from datetime import timedelta
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bucket interval -> (numpy datetime unit, step, date format for forecasts)
+INTERVALS = {
+    'hour': ('h', timedelta(hours=1), '%Y-%m-%d %H:%M:%S'),
+    'day': ('D', timedelta(days=1), '%Y-%m-%d'),
+}
+AGGREGATIONS = ('last', 'first', 'mean', 'sum', 'max', 'min', 'count')
+FILL_METHODS = ('ffill', 'zero', 'linear', 'none')
+
+
+class TimeResampler:
+    def __init__(self, interval: str = 'day', aggregation: str = 'last', fill: str = 'ffill'):
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown interval '{interval}', expected one of {sorted(INTERVALS)}")
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation '{aggregation}', expected one of {AGGREGATIONS}")
+        if fill not in FILL_METHODS:
+            raise ValueError(f"Unknown fill method '{fill}', expected one of {FILL_METHODS}")
+
+        self.interval = interval
+        self.aggregation = aggregation  # View counts are snapshots, so 'last' keeps the end-of-bucket reading
+        self.fill = fill
+        self.unit, self.step, self.date_format = INTERVALS[interval]
+
+    def resample(self, timestamps: Union[np.ndarray, Sequence], values: Union[np.ndarray, Sequence]) -> Tuple[np.ndarray, np.ndarray]:
+        """Bucket irregular observations into fixed intervals.
+
+        Returns (bucket_starts, values) where bucket_starts is a datetime64 array and
+        empty buckets between the first and last observation are filled per `fill`.
+        """
+        ts = np.asarray(timestamps, dtype='datetime64[s]')
+        vals = np.asarray(values, dtype=np.float64)
+        if ts.size == 0:
+            return np.array([], dtype=f'datetime64[{self.unit}]'), np.array([], dtype=np.float64)
+
+        order = np.argsort(ts, kind='stable')
+        buckets = ts[order].astype(f'datetime64[{self.unit}]')
+        vals = vals[order]
+
+        origin = buckets[0]
+        offsets = (buckets - origin).astype(np.int64)
+        # Offsets are sorted, so each bucket is a contiguous run
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(offsets)) + 1))
+        ends = np.append(starts[1:], len(offsets))
+        aggregated = self._aggregate(vals, starts, ends)
+
+        n_buckets = int(offsets[-1]) + 1
+        grid = origin + np.arange(n_buckets)
+        filled = np.full(n_buckets, np.nan)
+        filled[offsets[starts]] = aggregated
+        return self._fill_gaps(grid, filled)
+
+    def _aggregate(self, vals: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        if self.aggregation == 'last':
+            return vals[ends - 1]
+        if self.aggregation == 'first':
+            return vals[starts]
+        if self.aggregation == 'count':
+            return (ends - starts).astype(np.float64)
+        if self.aggregation == 'max':
+            return np.maximum.reduceat(vals, starts)
+        if self.aggregation == 'min':
+            return np.minimum.reduceat(vals, starts)
+
+        sums = np.add.reduceat(vals, starts)
+        return sums if self.aggregation == 'sum' else sums / (ends - starts)
+
+    def _fill_gaps(self, grid: np.ndarray, filled: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        empty = np.isnan(filled)
+        if not empty.any():
+            return grid, filled
+
+        if self.fill == 'none':
+            return grid[~empty], filled[~empty]
+        if self.fill == 'zero':
+            filled[empty] = 0.0
+        elif self.fill == 'ffill':
+            # The first bucket always holds an observation
+            last_seen = np.maximum.accumulate(np.where(empty, 0, np.arange(len(filled))))
+            filled = filled[last_seen]
+        else:
+            positions = np.arange(len(filled))
+            filled[empty] = np.interp(positions[empty], positions[~empty], filled[~empty])
+        return grid, filled
@@ -0,0 +1,130 @@
+import gzip
+import hashlib
+import json
+import logging
+import math
+from collections import OrderedDict
+from datetime import date, datetime, time
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _default(value: Any) -> Any:
+    # orjson writes dates and times as ISO 8601 ('T' separator), not str()'s space
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _finite(content: Any) -> Any:
+    """Replace NaN/Infinity with None, as orjson does"""
+    if isinstance(content, float):
+        return content if math.isfinite(content) else None
+    if isinstance(content, dict):
+        return {key: _finite(value) for key, value in content.items()}
+    if isinstance(content, (list, tuple)):
+        return [_finite(value) for value in content]
+    return content
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        body = json.dumps(content, ensure_ascii=False, separators=(',', ':'), allow_nan=False, default=_default)
+    except ValueError:
+        # Bare NaN is not valid JSON; only payloads that contain one pay for the extra walk
+        body = json.dumps(_finite(content), ensure_ascii=False, separators=(',', ':'), allow_nan=False, default=_default)
+    return body.encode('utf-8')
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick brotli or gzip from an Accept-Encoding header, honouring q=0"""
+    accepted = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+
+    for encoding in ('br', 'gzip'):
+        if encoding == 'br' and brotli is None:
+            continue
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class CompressedResponseCache:
+    """Build compressed JSON responses, caching compressed bodies by content digest.
+
+    Snapshot endpoints return identical payloads to many clients between refreshes,
+    so after the first request each one only pays for serialization and a hash.
+    """
+
+    def __init__(self, min_size: int = 1024, max_entries: int = 64):
+        self.min_size = min_size  # Smaller bodies are sent uncompressed
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[Tuple[bytes, str], bytes]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _compressed(self, body: bytes, encoding: str) -> bytes:
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        compressed = compress(body, encoding)
+        self._cache[key] = compressed
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return compressed
+
+    def render(self, request: Request, content: Any, status_code: int = 200) -> Response:
+        body = dumps(content)
+        headers = {'Vary': 'Accept-Encoding'}
+
+        encoding = negotiate_encoding(request.headers.get('accept-encoding', ''))
+        if encoding and len(body) >= self.min_size:
+            body = self._compressed(body, encoding)
+            headers['Content-Encoding'] = encoding
+
+        return Response(content=body, status_code=status_code, headers=headers, media_type='application/json')
+
+    def stats(self) -> Dict[str, Any]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._cache)}
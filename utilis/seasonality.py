@@ -0,0 +1,97 @@
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Weekly cycle on daily buckets, daily and weekly cycles on hourly buckets
+PERIODS_BY_INTERVAL = {
+    'day': (7,),
+    'hour': (24, 168),
+}
+DEFAULT_PERIODS = PERIODS_BY_INTERVAL['day']
+
+
+class SeasonalityDetector:
+    def __init__(self, candidate_periods: Sequence[int] = DEFAULT_PERIODS, threshold: float = 0.7):
+        self.candidate_periods = np.asarray(sorted(set(int(p) for p in candidate_periods if p > 1)), dtype=np.int64)
+        self.threshold = threshold  # Minimum autocorrelation to call a period seasonal
+
+    def _to_matrix(self, series: Union[np.ndarray, Sequence[Sequence[float]]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Stack series into a zero-padded matrix of detrended rows plus their lengths"""
+        if isinstance(series, np.ndarray) and series.ndim == 2:
+            matrix = series.astype(np.float64, copy=True)
+            lengths = np.full(matrix.shape[0], matrix.shape[1], dtype=np.int64)
+        else:
+            lengths = np.fromiter((len(s) for s in series), dtype=np.int64, count=len(series))
+            matrix = np.zeros((len(series), int(lengths.max()) if len(series) else 0), dtype=np.float64)
+            for row, values in enumerate(series):
+                matrix[row, :lengths[row]] = np.asarray(values, dtype=np.float64)
+
+        # Remove each row's least-squares line: a steady rise correlates with itself
+        # at every lag and would otherwise pass for a cycle of any candidate length
+        valid = np.arange(matrix.shape[1]) < lengths[:, None]
+        n = np.maximum(lengths, 1).astype(np.float64)[:, None]
+        row_mean = matrix.sum(axis=1, keepdims=True) / n
+        dx = np.where(valid, np.arange(matrix.shape[1]) - (n - 1) / 2, 0.0)
+        spread = (dx * dx).sum(axis=1, keepdims=True)
+        slope = np.divide((dx * (matrix - row_mean)).sum(axis=1, keepdims=True), spread,
+                          out=np.zeros_like(spread), where=spread > 0)
+        matrix = np.where(valid, matrix - row_mean - slope * dx, 0.0)
+        return matrix, lengths
+
+    def autocorrelation(self, series: Union[np.ndarray, Sequence[Sequence[float]]]) -> np.ndarray:
+        """Autocorrelation at every candidate period for a batch of series.
+
+        Rows are demeaned and zero-padded, so ragged series share one FFT and each
+        lag only sums over the pairs that exist in that row. Lags that need more
+        than half of a row are returned as NaN.
+        """
+        matrix, lengths = self._to_matrix(series)
+        n_rows = matrix.shape[0]
+        if n_rows == 0 or matrix.shape[1] == 0:
+            return np.full((n_rows, len(self.candidate_periods)), np.nan)
+
+        # Pad to at least 2n so the circular correlation equals the linear one
+        n_fft = 1 << int(2 * matrix.shape[1] - 1).bit_length()
+        spectrum = np.fft.rfft(matrix, n=n_fft, axis=1)
+        acov = np.fft.irfft(spectrum * np.conj(spectrum), n=n_fft, axis=1)
+
+        periods = self.candidate_periods[self.candidate_periods < matrix.shape[1]]
+        result = np.full((n_rows, len(self.candidate_periods)), np.nan)
+        if not len(periods):
+            return result
+
+        lengths_col = lengths[:, None].astype(np.float64)
+        variance = acov[:, :1] / np.maximum(lengths_col, 1)
+        lagged = acov[:, periods] / np.maximum(lengths_col - periods, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            acf = np.where(variance > 0, lagged / variance, 0.0)
+
+        # A cycle must repeat at least twice to be measured
+        acf[lengths_col < 2 * periods] = np.nan
+        result[:, :len(periods)] = acf
+        return result
+
+    def detect_batch(self, series: Union[np.ndarray, Sequence[Sequence[float]]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Detect the dominant seasonal period for many series in one call.
+
+        Returns (periods, strengths); period is 0 where no candidate clears the threshold.
+        """
+        acf = self.autocorrelation(series)
+        n_rows = acf.shape[0]
+        if n_rows == 0 or acf.shape[1] == 0:
+            return np.zeros(n_rows, dtype=np.int64), np.zeros(n_rows)
+
+        scores = np.nan_to_num(acf, nan=-np.inf)
+        best = scores.argmax(axis=1)
+        strengths = scores[np.arange(n_rows), best]
+        seasonal = strengths > self.threshold
+
+        periods = np.where(seasonal, self.candidate_periods[best], 0)
+        strengths = np.where(np.isfinite(strengths), strengths, 0.0)
+        return periods, strengths
+
+    def detect(self, values: Sequence[float]) -> Tuple[Optional[int], float]:
+        """Detect the dominant seasonal period for a single series"""
+        periods, strengths = self.detect_batch([values])
+        period = int(periods[0])
+        return (period or None), float(strengths[0])
@@ -1,9 +1,11 @@
 from collections import Counter
 import re
+from .topic_clustering import TopicClusterer
 
 class TrendAnalyzer:
     def __init__(self):
         self.common_words = set(['the', 'be', 'to', 'of', 'and', 'a', 'in', 'that'])
+        self.clusterer = TopicClusterer()
 
     def clean_text(self, text):
         # Remove special characters and convert to lowercase
@@ -14,28 +16,46 @@ class TrendAnalyzer:
         words = self.clean_text(text).split()
         return [w for w in words if w not in self.common_words]
 
+    def cluster_trends(self, platform_trends):
+        # Merge near-duplicate texts across platforms into topic clusters
+        clusters = {}
+        for platform, trends in platform_trends.items():
+            for trend in trends:
+                cluster_id = self.clusterer.assign(trend['text'], trend.get('hashtags'))
+                cluster = clusters.setdefault(cluster_id, {
+                    'cluster_id': cluster_id,
+                    'topic': self.clusterer.label(cluster_id),
+                    'size': 0,
+                    'platforms': {}
+                })
+                cluster['size'] += 1
+                cluster['platforms'][platform] = cluster['platforms'].get(platform, 0) + 1
+
+        return sorted(clusters.values(), key=lambda c: c['size'], reverse=True)
+
     def analyze_trends(self, tiktok_trends, twitter_trends):
-        # Combine trends from both platforms
-        all_trends = []
-        
+        # Count keyword frequency across both platforms as we go, without
+        # materializing a list of every keyword occurrence first
+        trend_counter = Counter()
         for trend in tiktok_trends:
-            keywords = self.extract_keywords(trend['text'])
-            all_trends.extend(keywords)
-            
+            trend_counter.update(self.extract_keywords(trend['text']))
+
         for trend in twitter_trends:
-            keywords = self.extract_keywords(trend['text'])
-            all_trends.extend(keywords)
+            trend_counter.update(self.extract_keywords(trend['text']))
 
-        # Count frequency of keywords
-        trend_counter = Counter(all_trends)
-        
+        topic_clusters = self.cluster_trends({'tiktok': tiktok_trends, 'twitter': twitter_trends})
+
+        platform_comparison = {
+            'tiktok': len(tiktok_trends),
+            'twitter': len(twitter_trends)
+        }
+        return self.build_report(trend_counter, platform_comparison, topic_clusters)
+
+    def build_report(self, trend_counter, platform_comparison, topic_clusters):
         # Format results
         analyzed_trends = {
             'top_keywords': dict(trend_counter.most_common(10)),
-            'platform_comparison': {
-                'tiktok': len(tiktok_trends),
-                'twitter': len(twitter_trends)
-            },
+            'platform_comparison': platform_comparison,
             'trending_topics': [
                 {
                     'topic': k,
@@ -43,7 +63,8 @@ class TrendAnalyzer:
                     'sentiment': 'positive' if v > 5 else 'neutral'
                 }
                 for k, v in trend_counter.most_common(5)
-            ]
+            ],
+            'topic_clusters': topic_clusters[:5]
         }
         
         return analyzed_trends
@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import re
+import threading
+import zlib
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text.lower()).split())
+
+
+class TopicClusterer:
+    """Assign near-duplicate topic texts to stable clusters with MinHash and LSH banding.
+
+    Only one signature per cluster is kept, and lookups touch `bands` hash buckets,
+    so assigning an item costs the same no matter how many texts were seen before.
+    Assignment is serialized, so one clusterer can be shared across threads.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.7,
+                 shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold  # Minimum estimated Jaccard similarity to join a cluster
+        self.shingle_size = shingle_size
+
+        # a * x + b stays below 2**64 for 32-bit shingle hashes
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)
+
+        self._buckets: List[Dict[bytes, str]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._labels: Dict[str, str] = {}
+        self._numbers: Dict[str, FrozenSet[str]] = {}  # Cluster id -> numeric tokens of its founder
+        self._exact: Dict[str, str] = {}  # Normalized text -> cluster id
+        self._lock = threading.Lock()
+
+    def shingles(self, text: str, hashtags: Optional[Iterable[str]] = None) -> Set[str]:
+        """Character n-grams and whole words of the normalized text plus one token per hashtag"""
+        normalized = normalize_text(text)
+        size = self.shingle_size
+        result = {normalized[i:i + size] for i in range(max(1, len(normalized) - size + 1))}
+        # Words weigh a differing token more than the one or two n-grams it changes
+        result.update(f"w:{word}" for word in normalized.split())
+        for tag in hashtags or []:
+            tag = normalize_text(str(tag)).replace(' ', '')
+            if tag:
+                result.add(f"#{tag}")
+        return result
+
+    def signature(self, shingles: Set[str]) -> np.ndarray:
+        """MinHash signature over a shingle set"""
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+        if not len(hashes):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def numbers(normalized: str) -> FrozenSet[str]:
+        """Numeric tokens, which tell apart otherwise identical titles ('world cup 2022' / '2026')"""
+        return frozenset(word for word in normalized.split() if word.isdigit())
+
+    def _band_keys(self, signature: np.ndarray, numbers: FrozenSet[str]) -> List[bytes]:
+        # Numbered siblings ('... 2024' / '... 2025') never share a bucket, so one the
+        # number gate would reject can't hold the bucket the other needs to match through
+        prefix = ' '.join(sorted(numbers)).encode() + b'|'
+        return [prefix + band.tobytes() for band in signature.reshape(self.bands, self.rows)]
+
+    def assign(self, text: str, hashtags: Optional[Iterable[str]] = None) -> str:
+        """Return the cluster id for a trend, creating a new cluster if nothing is close enough"""
+        normalized = normalize_text(text)
+        cluster_id = self._exact.get(normalized)
+        if cluster_id is not None:
+            return cluster_id
+
+        signature = self.signature(self.shingles(text, hashtags))
+        with self._lock:
+            return self._assign(normalized, text, signature)
+
+    def _assign(self, normalized: str, text: str, signature: np.ndarray) -> str:
+        cluster_id = self._exact.get(normalized)
+        if cluster_id is not None:
+            return cluster_id  # Another thread assigned the same text meanwhile
+
+        numbers = self.numbers(normalized)
+        band_keys = self._band_keys(signature, numbers)
+        candidates = {bucket[key] for bucket, key in zip(self._buckets, band_keys) if key in bucket}
+        best_id, best_similarity = None, self.threshold
+        for candidate in candidates:
+            if self._numbers[candidate] != numbers:
+                continue
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= best_similarity:
+                best_id, best_similarity = candidate, similarity
+
+        if best_id is None:
+            # Derive the id from the founding text so it survives restarts given the same data
+            best_id = hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest()
+            self._signatures[best_id] = signature
+            self._labels[best_id] = text.lower()
+            self._numbers[best_id] = numbers
+            for bucket, key in zip(self._buckets, band_keys):
+                bucket.setdefault(key, best_id)
+
+        self._exact[normalized] = best_id
+        return best_id
+
+    def label(self, cluster_id: str) -> str:
+        """Display label of a cluster: its founding text, lowercased"""
+        return self._labels.get(cluster_id, cluster_id)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
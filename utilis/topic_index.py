@@ -0,0 +1,128 @@
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from . import TrendPredictor
+from .topic_clustering import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class TopicIndex:
+    """In-memory index from normalized topic text to that topic's observation series.
+
+    Forecasts are computed on demand for a single topic and memoized until new
+    observations for that topic arrive or old ones age out, so a lookup never
+    touches other topics.
+    Observations older than `window_days` are dropped as new ones arrive, so a
+    topic's series stays bounded by the window rather than by uptime. Topic labels
+    come from the predictor's clusterer; pass the predictor that serves
+    /api/trend-predictions to get the same labels there and here.
+    """
+
+    def __init__(self, predictor: Optional[TrendPredictor] = None, window_days: int = 30):
+        self.predictor = predictor or TrendPredictor()
+        self.window_days = window_days  # Same look-back as /api/trend-predictions
+
+        self._aliases: Dict[str, int] = {}  # Normalized text -> series location
+        self._labels: List[str] = []
+        self._timestamps: List[array] = []  # Epoch seconds per location
+        self._views: List[array] = []
+        self._versions: List[int] = []
+        self._memo: Dict[int, Tuple[int, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, text: str, timestamp: datetime, view_count: Optional[int], hashtags: Optional[Iterable[str]] = None) -> None:
+        """Append one observation to its topic's series"""
+        seconds = int(np.datetime64(timestamp, 's').astype(np.int64))
+        with self._lock:
+            # Checked first, so an out-of-window row doesn't register an empty topic
+            if seconds < self._cutoff():
+                return
+
+            alias = normalize_text(text)
+            location = self._aliases.get(alias)
+            if location is None:
+                # Near-duplicate texts share the series of their topic cluster
+                label = self.predictor.clusterer.label(self.predictor.clusterer.assign(text, hashtags))
+                location = self._aliases.get(normalize_text(label))
+                if location is None:
+                    location = len(self._labels)
+                    self._labels.append(label)
+                    self._timestamps.append(array('q'))
+                    self._views.append(array('q'))
+                    self._versions.append(0)
+                    self._aliases[normalize_text(label)] = location
+                self._aliases[alias] = location
+
+            timestamps, views = self._timestamps[location], self._views[location]
+            if not timestamps or seconds >= timestamps[-1]:
+                timestamps.append(seconds)
+                views.append(view_count or 0)
+            else:
+                # Late arrivals are inserted in order so trimming the front stays valid
+                position = bisect_right(timestamps, seconds)
+                timestamps.insert(position, seconds)
+                views.insert(position, view_count or 0)
+            self._trim(location)
+            self._versions[location] += 1
+
+    def load(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Bulk-add history rows shaped like {'text', 'hashtags', 'view_count', 'created_at'}"""
+        count = 0
+        for row in rows:
+            self.add(row['text'], row['created_at'], row['view_count'], row.get('hashtags'))
+            count += 1
+        logger.info(f"Indexed {count} observations across {len(self._labels)} topics")
+        return count
+
+    def _cutoff(self) -> int:
+        return int(np.datetime64(datetime.utcnow() - timedelta(days=self.window_days), 's').astype(np.int64))
+
+    def _trim(self, location: int) -> None:
+        """Drop observations that fell out of the window (caller holds the lock)"""
+        timestamps, cutoff = self._timestamps[location], self._cutoff()
+        if timestamps and timestamps[0] < cutoff:
+            stale = bisect_left(timestamps, cutoff)
+            del timestamps[:stale]
+            del self._views[location][:stale]
+            self._versions[location] += 1  # A memoized forecast still covers the dropped points
+
+    def _series(self, location: int) -> Tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            # Topics that stopped receiving observations are trimmed on read
+            self._trim(location)
+            timestamps = np.array(self._timestamps[location], dtype=np.int64)
+            views = np.array(self._views[location], dtype=np.float64)
+        return timestamps.astype('datetime64[s]'), views
+
+    def forecast(self, topic: str) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """Return (topic label, predictions) for one topic, or None if the topic is unknown"""
+        location = self._aliases.get(normalize_text(topic))
+        if location is None:
+            return None
+
+        with self._lock:
+            self._trim(location)
+            version = self._versions[location]
+        memo = self._memo.get(location)
+        if memo is not None and memo[0] == version:
+            return self._labels[location], memo[1]
+
+        try:
+            series = self.predictor.prepare_arrays(*self._series(location))
+            predictions = self.predictor.forecast_series(series) if series is not None else []
+        except Exception as e:
+            logger.error(f"Error forecasting topic {topic}: {str(e)}")
+            predictions = []
+
+        self._memo[location] = (version, predictions)
+        return self._labels[location], predictions
+
+    def __len__(self) -> int:
+        return len(self._labels)